@@ -1,22 +1,39 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from pathlib import Path
 from zoneinfo import ZoneInfo
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
 from starlette.middleware.cors import CORSMiddleware
 
+from .catalog import current_generation
 from .config import settings
-from .database import create_session, get_session, init_db
-from .schemas import PaginatedPapers, RefreshResponse
-from .service import PaperService
+from .coordination import RefreshCoordinator, SchedulerLeadership
+from .database import create_session, init_db, run_in_session, shutdown_db_executor
+from .events import event_broker
+from .full_text import shutdown_extraction_pool
+from .http_client import close_http_client, get_http_client
+from .refresh_jobs import RefreshJob, RefreshJobRegistry
+from .response_cache import CachedBody, ResponseCache, etag_matches, make_etag
+from .schemas import CategoryOut, PaginatedPapers, PaperOut, RefreshJobOut, SearchResults
+from .serialization import dumps
+from .service import (
+    InvalidCursor,
+    InvalidProjection,
+    PaperService,
+    ProgressReporter,
+    RefreshStats,
+    parse_fields,
+)
+from .snapshots import publish_snapshot
+from .worker import run_summary_worker
 
 if TYPE_CHECKING:
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -34,23 +51,94 @@ app.add_middleware(
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+# Static digest written by backend.snapshots; created at startup, so don't require it at import
+app.mount(
+    "/digest",
+    StaticFiles(directory=settings.snapshot_dir, html=True, check_dir=False),
+    name="digest",
+)
 
 logger = logging.getLogger(__name__)
 
 _scheduler: Optional["AsyncIOScheduler"] = None
 _initial_refresh_task: Optional[asyncio.Task[None]] = None
+_summary_worker_task: Optional[asyncio.Task[None]] = None
+_summary_worker_stop = asyncio.Event()
+_summary_worker_wake = asyncio.Event()
+_refresh_coordinator = RefreshCoordinator()
+_leadership = SchedulerLeadership()
+_leadership_task: Optional[asyncio.Task[None]] = None
+_snapshot_task: Optional[asyncio.Task[bool]] = None
+_response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries if settings.response_cache_enabled else 0
+)
+
+
+T = TypeVar("T")
+
+
+async def read_with_service(operation: Callable[[PaperService], T]) -> T:
+    """Run a read-only ``PaperService`` call off the event loop on the DB executor."""
+
+    return await run_in_session(lambda session: operation(PaperService(session=session)))
+
 
+async def cached_response(
+    request: Request,
+    render: Callable[[], Awaitable[tuple[bytes, str]]],
+    *,
+    per_origin: bool = False,
+) -> Response:
+    """Serve a read endpoint from the generation-keyed cache with a strong ETag.
 
-def get_service(session: Session = Depends(get_session)) -> PaperService:
-    return PaperService(session=session)
+    ``render`` returns the body and media type; it only runs on a cache miss. Pages that
+    embed absolute URLs (``url_for``) pass ``per_origin`` so each scheme and host gets
+    its own entry.
+    """
+
+    generation = await run_in_session(current_generation)
+    origin = str(request.base_url) if per_origin else None
+    key = (origin, request.url.path, tuple(sorted(request.query_params.multi_items())), generation)
+    entry = _response_cache.get(key)
+    if entry is None:
+        body, media_type = await render()
+        entry = CachedBody(body=body, media_type=media_type, etag=make_etag(body))
+        _response_cache.put(key, entry)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={max(0, settings.response_cache_max_age_seconds)}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+
+def _json_body(value: object) -> tuple[bytes, str]:
+    if hasattr(value, "model_dump_json"):
+        return value.model_dump_json(by_alias=True).encode(), "application/json"  # type: ignore[attr-defined]
+    payload = [item.model_dump(mode="json", by_alias=True) if hasattr(item, "model_dump") else item for item in value]  # type: ignore[attr-defined]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(), "application/json"
 
 
 @app.on_event("startup")
 async def startup_event() -> None:
-    global _scheduler, _initial_refresh_task
+    global _scheduler, _initial_refresh_task, _summary_worker_task, _leadership_task
     init_db()
+    get_http_client()
+    if settings.snapshot_enabled:
+        Path(settings.snapshot_dir).mkdir(parents=True, exist_ok=True)
+
+    if settings.summary_worker_enabled:
+        _summary_worker_stop.clear()
+        _summary_worker_task = asyncio.create_task(
+            run_summary_worker(_summary_worker_stop, wake=_summary_worker_wake)
+        )
 
     if settings.scheduler_enabled:
+        # Only one process per database runs the cron and startup refreshes.
+        _leadership.campaign()
+        _leadership_task = asyncio.create_task(_leadership.maintain())
+
         from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
         timezone = ZoneInfo(settings.scheduler_timezone)
@@ -77,35 +165,72 @@ async def startup_event() -> None:
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
-    global _scheduler, _initial_refresh_task
+    global _scheduler, _initial_refresh_task, _summary_worker_task, _leadership_task
     if _scheduler:
         _scheduler.shutdown(wait=False)
         _scheduler = None
+    if _leadership_task:
+        _leadership_task.cancel()
+        _leadership_task = None
+        _leadership.resign()
     if _initial_refresh_task and not _initial_refresh_task.done():
         _initial_refresh_task.cancel()
     _initial_refresh_task = None
+    _refresh_coordinator.cancel()
+    event_broker.close_all()
+    if _summary_worker_task:
+        _summary_worker_stop.set()
+        _summary_worker_task.cancel()
+        _summary_worker_task = None
+    await close_http_client()
+    shutdown_extraction_pool()
+    shutdown_db_executor()
 
 
-async def scheduled_refresh_job() -> None:
+async def _run_refresh(progress: ProgressReporter | None = None) -> RefreshStats:
     session = create_session()
     try:
         service = PaperService(session=session)
-        try:
-            stats = await service.refresh()
-        except Exception:
-            logger.exception("Scheduled refresh failed")
-            raise
-        else:
-            logger.info(
-                "Scheduled refresh finished: fetched=%s created=%s summarized=%s",
-                stats.fetched,
-                stats.created,
-                stats.summarized,
-            )
+        return await service.refresh(drain=False, progress=progress)
     finally:
         session.close()
 
 
+def _refresh_finished(job: RefreshJob) -> None:
+    global _snapshot_task
+    if job.status != RefreshJob.SUCCEEDED:
+        logger.info("Refresh job %s ended with status %s", job.id, job.status)
+        return
+    _summary_worker_wake.set()
+    if settings.snapshot_enabled and (_snapshot_task is None or _snapshot_task.done()):
+        _snapshot_task = asyncio.create_task(publish_snapshot())
+    logger.info(
+        "Refresh job %s finished: fetched=%s created=%s enqueued=%s timings=%s",
+        job.id,
+        job.stats.fetched,
+        job.stats.created,
+        job.stats.enqueued,
+        job.stats.timings,
+    )
+
+
+_refresh_jobs = RefreshJobRegistry(_refresh_coordinator, _run_refresh, on_finish=_refresh_finished)
+
+
+async def scheduled_refresh_job() -> None:
+    if settings.scheduler_enabled and not _leadership.is_leader:
+        logger.info("Skipping scheduled refresh; another instance holds scheduler leadership")
+        return
+    job = await _refresh_jobs.wait(_refresh_jobs.start())
+    if job.status == RefreshJob.FAILED:
+        raise RuntimeError(f"Scheduled refresh failed: {job.error}")
+
+
+def require_admin(x_admin_token: str | None = Header(default=None, convert_underscores=False)) -> None:
+    if settings.admin_token and x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
@@ -113,45 +238,163 @@ async def healthcheck() -> dict[str, str]:
 
 @app.get("/api/papers", response_model=PaginatedPapers)
 async def list_papers(
+    request: Request,
     category: str | None = Query(default=None, description="Filter by arXiv category code"),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    service: PaperService = Depends(get_service),
-) -> PaginatedPapers:
-    return service.list_papers(category=category, limit=limit, offset=offset)
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    include_total: bool | None = Query(default=None, description="Count matches; defaults to first page only"),
+    fields: str | None = Query(
+        default=None,
+        description="Comma-separated paper fields to return, e.g. arxiv_id,title,published_at",
+    ),
+) -> Response:
+    try:
+        projection = parse_fields(fields)
+    except InvalidProjection as exc:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {exc}") from None
+
+    async def render() -> tuple[bytes, str]:
+        # Core rows straight to JSON bytes; no ORM objects or per-row PaperOut validation.
+        document = await read_with_service(
+            lambda service: service.list_papers_document(
+                category=category,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
+                fields=projection,
+            )
+        )
+        return dumps(document), "application/json"
 
+    try:
+        return await cached_response(request, render)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
 
-@app.get("/api/categories")
-async def categories(service: PaperService = Depends(get_service)) -> list[str]:
-    categories = service.distinct_categories()
-    return categories or list(settings.arxiv_categories)
 
+@app.get("/api/papers/{arxiv_id:path}", response_model=PaperOut)
+async def paper_detail(request: Request, arxiv_id: str) -> Response:
+    async def render() -> tuple[bytes, str]:
+        paper = await read_with_service(lambda service: service.get_paper(arxiv_id))
+        if paper is None:
+            raise HTTPException(status_code=404, detail="Paper not found")
+        return _json_body(paper)
 
-@app.post("/api/refresh", response_model=RefreshResponse)
-async def refresh_endpoint(
-    service: PaperService = Depends(get_service),
-    x_admin_token: str | None = Header(default=None, convert_underscores=False),
-) -> RefreshResponse:
-    if settings.admin_token and x_admin_token != settings.admin_token:
-        raise HTTPException(status_code=401, detail="Invalid admin token")
-    stats = await service.refresh()
-    logger.info(
-        "Manual refresh finished: fetched=%s created=%s summarized=%s",
-        stats.fetched,
-        stats.created,
-        stats.summarized,
+    return await cached_response(request, render)
+
+
+@app.get("/api/search", response_model=SearchResults)
+async def search_papers(
+    request: Request,
+    q: str = Query(min_length=1, max_length=200, description="Words to match in title, authors, abstract or summary"),
+    category: str | None = Query(default=None, description="Filter by arXiv category code"),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Response:
+    async def render() -> tuple[bytes, str]:
+        return _json_body(await read_with_service(lambda service: service.search(q, category=category, limit=limit)))
+
+    return await cached_response(request, render)
+
+
+@app.get("/api/categories", response_model=list[str])
+async def categories(request: Request) -> Response:
+    async def render() -> tuple[bytes, str]:
+        categories = await read_with_service(PaperService.distinct_categories)
+        return _json_body(categories or list(settings.arxiv_categories))
+
+    return await cached_response(request, render)
+
+
+@app.get("/api/categories/stats", response_model=list[CategoryOut])
+async def category_stats(request: Request) -> Response:
+    async def render() -> tuple[bytes, str]:
+        return _json_body(await read_with_service(PaperService.category_stats))
+
+    return await cached_response(request, render)
+
+
+@app.get("/api/events")
+async def paper_events(
+    last_event_id: Optional[str] = Query(default=None),
+    last_event_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Server-sent events for papers created or summarized in this process.
+
+    Browsers resend the last received id in ``Last-Event-ID`` when they reconnect; the
+    ``last_event_id`` query parameter serves clients that open a fresh EventSource.
+    """
+
+    resume_from = _parse_event_id(last_event_header) or _parse_event_id(last_event_id)
+
+    async def stream() -> AsyncIterator[bytes]:
+        # subscribe only once the body is being sent: if the client is gone before the
+        # response starts, this generator never runs and nothing is left registered
+        with event_broker.subscribe(resume_from) as subscription:
+            yield b"retry: 3000\n\n"
+            async for frame in subscription.frames(heartbeat=settings.event_heartbeat_seconds):
+                yield frame
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return stats.to_response()
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+@app.post(
+    "/api/refresh",
+    response_model=RefreshJobOut,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def refresh_endpoint(response: Response) -> RefreshJobOut:
+    # Returns the already-running job instead of starting a second refresh.
+    job = _refresh_jobs.start()
+    response.headers["Location"] = f"/api/refresh/{job.id}"
+    return job.to_response()
+
+
+@app.get("/api/refresh/{job_id}", response_model=RefreshJobOut)
+async def refresh_status(job_id: str) -> RefreshJobOut:
+    job = _refresh_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job.to_response()
+
+
+@app.post(
+    "/api/refresh/{job_id}/cancel",
+    response_model=RefreshJobOut,
+    dependencies=[Depends(require_admin)],
+)
+async def cancel_refresh(job_id: str) -> RefreshJobOut:
+    job = _refresh_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job.to_response()
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request, service: PaperService = Depends(get_service)) -> HTMLResponse:
-    categories = service.distinct_categories() or settings.arxiv_categories
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "categories": categories,
-            "default_category": categories[0] if categories else None,
-        },
-    )
+async def index(request: Request) -> Response:
+    async def render() -> tuple[bytes, str]:
+        categories = await read_with_service(PaperService.distinct_categories) or settings.arxiv_categories
+        page = templates.TemplateResponse(
+            request,
+            "index.html",
+            {
+                "categories": categories,
+                "default_category": categories[0] if categories else None,
+            },
+        )
+        return bytes(page.body), "text/html; charset=utf-8"
+
+    return await cached_response(request, render, per_origin=True)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .models import CategoryStat, CorpusState
+from .schemas import CategoryOut
+from .timeutil import as_naive_utc, utcnow
+
+
+def current_generation(session: Session) -> int:
+    return session.scalar(select(CorpusState.generation).where(CorpusState.id == 1)) or 0
+
+
+def bump_generation(session: Session) -> None:
+    """Stage a corpus generation bump; it becomes visible with the caller's commit."""
+
+    result = session.execute(
+        update(CorpusState)
+        .where(CorpusState.id == 1)
+        .values(generation=CorpusState.generation + 1, updated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.add(CorpusState(id=1, generation=1, updated_at=utcnow()))
+
+
+def apply_category_changes(
+    session: Session,
+    removed: Iterable[str],
+    added: Iterable[tuple[str, datetime]],
+) -> None:
+    """Adjust category_stats by the rows just removed from and added to paper_categories."""
+
+    delta: Counter[str] = Counter()
+    latest: dict[str, datetime] = {}
+    for category in removed:
+        delta[category] -= 1
+    for category, published_at in added:
+        delta[category] += 1
+        if category not in latest or as_naive_utc(published_at) > as_naive_utc(latest[category]):
+            latest[category] = published_at
+    touched = [category for category in delta if delta[category] or category in latest]
+    if not touched:
+        return
+
+    stats = {
+        stat.category: stat
+        for stat in session.scalars(select(CategoryStat).where(CategoryStat.category.in_(touched)))
+    }
+    for category in touched:
+        stat = stats.get(category)
+        if stat is None:
+            if delta[category] <= 0:
+                continue
+            stat = CategoryStat(category=category, paper_count=0)
+            session.add(stat)
+        stat.paper_count = max(0, (stat.paper_count or 0) + delta[category])  # type: ignore[assignment]
+        published_at = latest.get(category)
+        if published_at is not None and (
+            stat.latest_published_at is None or as_naive_utc(published_at) > as_naive_utc(stat.latest_published_at)  # type: ignore[arg-type]
+        ):
+            stat.latest_published_at = published_at  # type: ignore[assignment]
+        if not stat.paper_count and category in stats:
+            session.delete(stat)
+
+
+class CategoryCatalog:
+    """Process-wide cache of category_stats, refreshed only when the corpus generation moves."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bind: Any = None
+        self._generation: int | None = None
+        self._entries: list[CategoryOut] = []
+
+    def entries(self, session: Session) -> list[CategoryOut]:
+        bind = session.get_bind()
+        generation = current_generation(session)
+        with self._lock:
+            if bind is self._bind and generation == self._generation:
+                return list(self._entries)
+        entries = [
+            CategoryOut.model_validate(stat)
+            for stat in session.scalars(select(CategoryStat).order_by(CategoryStat.category))
+            if stat.paper_count
+        ]
+        with self._lock:
+            self._bind, self._generation, self._entries = bind, generation, entries
+        return list(entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bind, self._generation, self._entries = None, None, []
+
+
+category_catalog = CategoryCatalog()
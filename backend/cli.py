@@ -2,13 +2,21 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import signal
 from typing import Sequence
 
+from .config import settings
+from .coordination import RefreshCoordinator
 from .database import create_session, init_db
+from .full_text import shutdown_extraction_pool
+from .http_client import close_http_client, get_http_client
 from .service import PaperService
+from .snapshots import publish_snapshot
+from .worker import SummaryWorker, run_summary_worker
 
 
 async def refresh_once(categories: Sequence[str] | None = None) -> None:
+    get_http_client()
     session = create_session()
     try:
         service = PaperService(session=session)
@@ -32,12 +40,70 @@ async def refresh_once(categories: Sequence[str] | None = None) -> None:
                 flush=True,
             )
 
-        stats = await service.refresh(categories=categories, progress=report_progress)
+        stats = await RefreshCoordinator().run(
+            lambda: service.refresh(categories=categories, progress=report_progress)
+        )
+        cache = service.summarizer.cache
     finally:
         session.close()
+        await close_http_client()
+    if stats is None:
+        print("Another refresh was already running and has finished.")
+        return
     print(
         f"Fetched: {stats.fetched}, created: {stats.created}, summarized: {stats.summarized}",
     )
+    if stats.enqueued > stats.summarized:
+        print(f"{stats.enqueued - stats.summarized} papers remain queued for a retry.")
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(f"LLM cache: hits={cache_stats['hits']} misses={cache_stats['misses']}")
+    if await publish_snapshot():
+        print(f"Static snapshot written to {settings.snapshot_dir}")
+
+
+async def summarize_backlog() -> None:
+    get_http_client()
+    session = create_session()
+    try:
+        worker = SummaryWorker(session)
+        if not worker.service.summarizer.uses_llm:
+            print("LLM API key is not configured; nothing to do.")
+            return
+        queued = worker.queue.enqueue_missing()
+        session.commit()
+        print(f"Queued {queued} papers without a summary. Processing...", flush=True)
+        outcome = {"summarized": 0, "failed": 0}
+
+        def report(paper, summarized: bool) -> None:
+            outcome["summarized" if summarized else "failed"] += 1
+            title = paper.title.replace("\n", " ").strip()
+            if len(title) > 80:
+                title = f"{title[:77]}..."
+            print(f"[{'ok' if summarized else 'failed'}] {title}", flush=True)
+
+        await worker.drain(on_result=report)
+    finally:
+        session.close()
+        await close_http_client()
+    print(f"Summarized: {outcome['summarized']}, failed: {outcome['failed']}")
+    if outcome["summarized"] and await publish_snapshot():
+        print(f"Static snapshot written to {settings.snapshot_dir}")
+
+
+async def run_worker() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except NotImplementedError:  # pragma: no cover - Windows event loops
+            pass
+    get_http_client()
+    try:
+        await run_summary_worker(stop)
+    finally:
+        await close_http_client()
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -53,6 +119,12 @@ def build_parser() -> argparse.ArgumentParser:
         help="Limit refresh to specific arXiv categories",
     )
 
+    subparsers.add_parser("summarize", help="Queue papers missing a summary and work off the queue")
+    subparsers.add_parser(
+        "worker",
+        help="Run a long-lived summary worker; several may share one database",
+    )
+
     return parser
 
 
@@ -64,8 +136,15 @@ def main(argv: Sequence[str] | None = None) -> None:
         return
 
     init_db()
-    if args.command == "refresh":
-        asyncio.run(refresh_once(categories=args.categories))
+    try:
+        if args.command == "refresh":
+            asyncio.run(refresh_once(categories=args.categories))
+        elif args.command == "summarize":
+            asyncio.run(summarize_backlog())
+        elif args.command == "worker":
+            asyncio.run(run_worker())
+    finally:
+        shutdown_extraction_pool()
 
 
 if __name__ == "__main__":
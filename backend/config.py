@@ -16,6 +16,8 @@ class Settings(BaseSettings):
 
     arxiv_categories: List[str] | str = ["cs.DC", "cs.OS", "cs.AR"]
     max_results_per_category: int = 25
+    feed_conditional_requests: bool = True
+    refresh_batch_size: int = 100
     refresh_interval_minutes: int = 180  # deprecated
     refresh_hour: int = 8
     refresh_minute: int = 0
@@ -28,10 +30,55 @@ class Settings(BaseSettings):
     summary_language: str = "zh"
     admin_token: str | None = None
     scheduler_enabled: bool = True
+    scheduler_leader_ttl_seconds: int = 60
+    refresh_lock_ttl_seconds: int = 300
+    refresh_lock_poll_seconds: float = 2
     request_timeout_seconds: int = 20
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30
+    http2_enabled: bool = False
     full_text_chunk_chars: int = 6000
     full_text_chunk_overlap: int = 500
     full_text_max_chunks: int = 6
+    full_text_skip_back_matter: bool = True
+    full_text_fetch_concurrency: int = 4
+    full_text_extract_concurrency: int = 2
+    summary_concurrency: int = 4
+    pdf_max_bytes: int = 50 * 1024 * 1024
+    pdf_spool_memory_bytes: int = 8 * 1024 * 1024
+    pdf_extract_workers: int = 2
+    pdf_extract_timeout_seconds: float = 120
+    pdf_extract_max_tasks_per_child: int = 25
+    pdf_cache_dir: str = "./pdf_cache"
+    pdf_cache_max_bytes: int = 512 * 1024 * 1024
+    summary_chunk_concurrency: int = 3
+    summary_worker_enabled: bool = True
+    summary_worker_batch_size: int = 8
+    summary_worker_poll_seconds: float = 30
+    summary_job_lease_seconds: int = 300
+    summary_job_max_attempts: int = 5
+    summary_job_retry_base_seconds: int = 60
+    summary_job_retry_max_seconds: int = 6 * 3600
+    # re-summarizing a revised abstract waits behind papers that have no summary yet
+    summary_revision_priority: int = -10
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_hours: int = 720
+    llm_cache_max_entries: int = 5000
+    snapshot_enabled: bool = True
+    snapshot_dir: str = "./snapshots"
+    snapshot_papers_per_category: int = 100
+    snapshot_base_url: str | None = None
+    event_history_size: int = 1000
+    event_client_buffer: int = 256
+    event_heartbeat_seconds: float = 15
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 512
+    response_cache_max_age_seconds: int = 60
+    db_executor_workers: int = 8
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
     sqlite_busy_timeout_seconds: int = 30
     sqlite_journal_mode: str = "WAL"
 
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import Settings, settings
+from .database import create_session
+from .models import CoordinationLease
+from .service import RefreshStats
+from .timeutil import as_aware_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    # containers often share pid 1, so add a random suffix to keep ids unique across nodes
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class DatabaseLease:
+    """A named, expiring lock row shared by every process using the same database."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        owner: str,
+        ttl_seconds: float,
+        session_factory: Callable[[], Session] = create_session,
+    ) -> None:
+        self.name = name
+        self.owner = owner
+        self.ttl_seconds = ttl_seconds
+        self._session_factory = session_factory
+
+    def try_acquire(self) -> bool:
+        """Take the lease if it is free, expired or already ours."""
+
+        now = utcnow()
+        session = self._session_factory()
+        try:
+            if session.get(CoordinationLease, self.name) is None:
+                try:
+                    session.add(CoordinationLease(name=self.name))
+                    session.commit()
+                except IntegrityError:  # created concurrently by another process
+                    session.rollback()
+            result = session.execute(
+                update(CoordinationLease)
+                .where(
+                    CoordinationLease.name == self.name,
+                    or_(
+                        CoordinationLease.owner.is_(None),
+                        CoordinationLease.owner == self.owner,
+                        CoordinationLease.expires_at < now,
+                    ),
+                )
+                .values(
+                    owner=self.owner,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                    acquired_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount == 1
+        finally:
+            session.close()
+
+    def renew(self) -> bool:
+        session = self._session_factory()
+        try:
+            result = session.execute(
+                update(CoordinationLease)
+                .where(CoordinationLease.name == self.name, CoordinationLease.owner == self.owner)
+                .values(expires_at=utcnow() + timedelta(seconds=self.ttl_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount == 1
+        finally:
+            session.close()
+
+    def release(self, result: str | None = None) -> None:
+        session = self._session_factory()
+        try:
+            session.execute(
+                update(CoordinationLease)
+                .where(CoordinationLease.name == self.name, CoordinationLease.owner == self.owner)
+                .values(owner=None, expires_at=None, last_result=result)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    def snapshot(self) -> tuple[bool, str | None]:
+        """Return whether someone currently holds the lease and the last published result."""
+
+        session = self._session_factory()
+        try:
+            row = session.get(CoordinationLease, self.name)
+            if row is None:
+                return False, None
+            expires_at = row.expires_at
+            held = row.owner is not None and expires_at is not None and as_aware_utc(expires_at) > utcnow()
+            return held, row.last_result  # type: ignore[return-value]
+        finally:
+            session.close()
+
+
+class RefreshCoordinator:
+    """Single-flight refresh across the scheduler, startup task, admin endpoint and CLI.
+
+    Callers in this process attach to the running refresh task; callers in other
+    processes are kept out by the ``refresh`` lease and wait for its published result.
+    """
+
+    LEASE_NAME = "refresh"
+
+    def __init__(self, configuration: Settings | None = None, *, owner: str | None = None) -> None:
+        self.settings = configuration or settings
+        self.owner = owner or default_worker_id()
+        self._current: asyncio.Task[RefreshStats | None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._current is not None and not self._current.done()
+
+    async def run(self, refresh: Callable[[], Awaitable[RefreshStats]]) -> RefreshStats | None:
+        """Run ``refresh`` unless one is already in flight; returns ``None`` if the other run left no result."""
+
+        if not self.running:
+            self._current = asyncio.create_task(self._run_exclusive(refresh))
+        assert self._current is not None
+        # shield: a cancelled caller (e.g. a dropped HTTP request) must not abort the shared refresh
+        return await asyncio.shield(self._current)
+
+    def cancel(self) -> bool:
+        """Cancel the in-flight refresh for every attached caller; the lease is released on unwind."""
+
+        if not self.running:
+            return False
+        assert self._current is not None
+        self._current.cancel()
+        return True
+
+    async def _run_exclusive(self, refresh: Callable[[], Awaitable[RefreshStats]]) -> RefreshStats | None:
+        lease = DatabaseLease(self.LEASE_NAME, owner=self.owner, ttl_seconds=self.settings.refresh_lock_ttl_seconds)
+        if not lease.try_acquire():
+            logger.info("Refresh already running in another process; waiting for it")
+            return await self._wait_for_other(lease)
+        keepalive = asyncio.create_task(_renew_periodically(lease))
+        result: str | None = None
+        try:
+            stats = await refresh()
+            result = json.dumps(asdict(stats))
+            return stats
+        finally:
+            keepalive.cancel()
+            lease.release(result)
+
+    async def _wait_for_other(self, lease: DatabaseLease) -> RefreshStats | None:
+        while True:
+            held, result = lease.snapshot()
+            if not held:
+                break
+            await asyncio.sleep(self.settings.refresh_lock_poll_seconds)
+        if not result:
+            return None
+        try:
+            return RefreshStats(**json.loads(result))
+        except (TypeError, ValueError):
+            return None
+
+
+class SchedulerLeadership:
+    """Elects one process per database to run scheduled and startup refreshes."""
+
+    LEASE_NAME = "scheduler-leader"
+
+    def __init__(self, configuration: Settings | None = None, *, owner: str | None = None) -> None:
+        self.settings = configuration or settings
+        self._lease = DatabaseLease(
+            self.LEASE_NAME,
+            owner=owner or default_worker_id(),
+            ttl_seconds=self.settings.scheduler_leader_ttl_seconds,
+        )
+        self.is_leader = False
+
+    def campaign(self) -> bool:
+        was_leader = self.is_leader
+        try:
+            self.is_leader = self._lease.renew() if was_leader else self._lease.try_acquire()
+        except Exception:
+            logger.exception("Scheduler leader election failed")
+            self.is_leader = False
+        if self.is_leader != was_leader:
+            logger.info("Scheduler leadership %s", "acquired" if self.is_leader else "lost")
+        return self.is_leader
+
+    async def maintain(self) -> None:
+        interval = max(1.0, self.settings.scheduler_leader_ttl_seconds / 3)
+        while True:
+            self.campaign()
+            await asyncio.sleep(interval)
+
+    def resign(self) -> None:
+        if self.is_leader:
+            self._lease.release()
+            self.is_leader = False
+
+
+async def _renew_periodically(lease: DatabaseLease) -> None:
+    interval = max(1.0, lease.ttl_seconds / 3)
+    while True:
+        await asyncio.sleep(interval)
+        if not lease.renew():
+            logger.warning("Lost the %s lease while still running", lease.name)
+            return
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Generator
-from typing import Any
+import asyncio
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy import bindparam, create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from .config import settings
@@ -15,6 +19,43 @@ class Base(DeclarativeBase):
 
 _engine = None
 _SessionLocal: sessionmaker | None = None
+_search_index_ready = False
+_db_executor: ThreadPoolExecutor | None = None
+
+T = TypeVar("T")
+
+# External-content FTS5 index over papers; the triggers keep it in step with every
+# INSERT/UPDATE/DELETE, including the native upserts used during ingest.
+_SEARCH_INDEX_DDL = (
+    """
+    CREATE VIRTUAL TABLE papers_fts USING fts5(
+        title, authors, abstract, summary,
+        content='papers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, title, authors, abstract, summary)
+        VALUES (new.id, new.title, new.authors, new.abstract, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, authors, abstract, summary)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE OF title, authors, abstract, summary ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, authors, abstract, summary)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract, old.summary);
+        INSERT INTO papers_fts(rowid, title, authors, abstract, summary)
+        VALUES (new.id, new.title, new.authors, new.abstract, new.summary);
+    END
+    """,
+    "INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')",
+)
 
 
 def _build_engine(database_url: str) -> Any:
@@ -22,7 +63,21 @@ def _build_engine(database_url: str) -> Any:
     if database_url.startswith("sqlite"):
         connect_args["check_same_thread"] = False
         connect_args["timeout"] = max(1, settings.sqlite_busy_timeout_seconds)
-    engine = create_engine(database_url, future=True, echo=False, connect_args=connect_args)
+    engine_args: dict[str, Any] = {}
+    if not _is_memory_url(database_url):
+        # sized for the read executor plus the refresh and summary worker sessions
+        engine_args.update(
+            pool_size=max(1, settings.db_pool_size),
+            max_overflow=max(0, settings.db_max_overflow),
+            pool_timeout=settings.db_pool_timeout_seconds,
+        )
+    engine = create_engine(
+        database_url,
+        future=True,
+        echo=False,
+        connect_args=connect_args,
+        **engine_args,
+    )
 
     if database_url.startswith("sqlite"):
         _configure_sqlite_engine(engine)
@@ -45,9 +100,15 @@ def _configure_sqlite_engine(engine: Any) -> None:
             cursor.close()
 
 
+def _is_memory_url(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
 def configure_engine(database_url: str | None = None) -> None:
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _search_index_ready
     database_url = database_url or settings.database_url
+    _search_index_ready = False
     _engine = _build_engine(database_url)
     _SessionLocal = sessionmaker(bind=_engine, autocommit=False, autoflush=False, future=True)
 
@@ -90,9 +151,223 @@ def _ensure_schema() -> None:
     if "author_affiliations" not in columns:
         with engine.begin() as connection:
             connection.execute(text("ALTER TABLE papers ADD COLUMN author_affiliations TEXT"))
+    if "base_id" not in columns:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE papers ADD COLUMN base_id VARCHAR(50)"))
+            connection.execute(text("ALTER TABLE papers ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+            connection.execute(text("ALTER TABLE papers ADD COLUMN abstract_hash VARCHAR(64)"))
+    add_summary_hash = "summary_abstract_hash" not in columns
+    if add_summary_hash:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE papers ADD COLUMN summary_abstract_hash VARCHAR(64)"))
+    # must run before the unique base_id index below is created
+    merged = _backfill_paper_versions(engine)
+    if add_summary_hash:
+        # existing summaries were written from the abstract currently stored
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "UPDATE papers SET summary_abstract_hash = abstract_hash "
+                    "WHERE summary IS NOT NULL AND summary <> ''"
+                )
+            )
+    # create_all skips indexes on tables that already exist
+    from .models import Paper
+
+    for index in Paper.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    backfilled = _backfill_paper_categories(engine)
+    _ensure_category_stats(engine, rebuild=backfilled or merged)
+    if engine.dialect.name == "sqlite":
+        _ensure_search_index(engine)
+
+
+def _backfill_paper_versions(engine: Any) -> bool:
+    """Fill base_id/version/abstract_hash and fold rows stored per arXiv version into one.
+
+    The newest version of each paper is kept; it inherits an older version's summary
+    when the abstract did not change. Returns True if any row was removed.
+    """
+
+    from .models import abstract_fingerprint, split_arxiv_id
+
+    with engine.begin() as connection:
+        pending = connection.execute(
+            text("SELECT id, arxiv_id, abstract FROM papers WHERE base_id IS NULL")
+        ).all()
+        if not pending:
+            return False
+        connection.execute(
+            text(
+                "UPDATE papers SET base_id = :base_id, version = :version, abstract_hash = :abstract_hash "
+                "WHERE id = :id"
+            ),
+            [
+                {
+                    "id": row.id,
+                    "base_id": split_arxiv_id(row.arxiv_id)[0],
+                    "version": split_arxiv_id(row.arxiv_id)[1],
+                    "abstract_hash": abstract_fingerprint(row.abstract),
+                }
+                for row in pending
+            ],
+        )
+        duplicates = connection.execute(
+            text(
+                "SELECT id, base_id, abstract_hash, summary, summary_model, summary_language, last_summarized_at "
+                "FROM papers WHERE base_id IN (SELECT base_id FROM papers GROUP BY base_id HAVING COUNT(*) > 1) "
+                "ORDER BY base_id, version DESC, id DESC"
+            )
+        ).all()
+        keeper = None
+        keeper_summarized = False
+        removed: list[int] = []
+        for row in duplicates:
+            if keeper is None or keeper.base_id != row.base_id:
+                keeper, keeper_summarized = row, bool(row.summary)
+                continue
+            removed.append(row.id)
+            if not keeper_summarized and row.summary and row.abstract_hash == keeper.abstract_hash:
+                connection.execute(
+                    text(
+                        "UPDATE papers SET summary = :summary, summary_model = :summary_model, "
+                        "summary_language = :summary_language, last_summarized_at = :last_summarized_at "
+                        "WHERE id = :id"
+                    ),
+                    {
+                        "id": keeper.id,
+                        "summary": row.summary,
+                        "summary_model": row.summary_model,
+                        "summary_language": row.summary_language,
+                        "last_summarized_at": row.last_summarized_at,
+                    },
+                )
+                keeper_summarized = True
+        for start in range(0, len(removed), 500):
+            ids = {"ids": removed[start : start + 500]}
+            expanding = bindparam("ids", expanding=True)
+            connection.execute(
+                text(
+                    "DELETE FROM summary_job_attempts WHERE job_id IN "
+                    "(SELECT id FROM summary_jobs WHERE paper_id IN :ids)"
+                ).bindparams(expanding),
+                ids,
+            )
+            for table in ("summary_jobs", "paper_categories"):
+                connection.execute(
+                    text(f"DELETE FROM {table} WHERE paper_id IN :ids").bindparams(expanding), ids
+                )
+            connection.execute(text("DELETE FROM papers WHERE id IN :ids").bindparams(expanding), ids)
+    return bool(removed)
+
+
+def _backfill_paper_categories(engine: Any, chunk_size: int = 1000) -> bool:
+    """Index papers stored before paper_categories existed; a no-op once every paper has rows."""
+
+    from .models import PaperCategory, split_categories
+
+    # a paper without categories never gets rows, so it must not count as pending on every boot
+    query = text(
+        "SELECT id, categories, published_at FROM papers "
+        "WHERE TRIM(REPLACE(categories, ',', '')) <> '' "
+        "AND NOT EXISTS (SELECT 1 FROM paper_categories WHERE paper_categories.paper_id = papers.id)"
+    ).columns(published_at=PaperCategory.__table__.c.published_at.type)
+    with engine.begin() as connection:
+        pending = connection.execute(query).all()
+        for start in range(0, len(pending), chunk_size):
+            rows = [
+                {"paper_id": row.id, "category": category, "published_at": row.published_at}
+                for row in pending[start : start + chunk_size]
+                for category in split_categories(row.categories)
+            ]
+            if rows:
+                connection.execute(PaperCategory.__table__.insert(), rows)
+    return bool(pending)
+
+
+def _ensure_category_stats(engine: Any, *, rebuild: bool) -> None:
+    """Seed the corpus generation row and (re)build category_stats from paper_categories."""
+
+    with engine.begin() as connection:
+        if connection.execute(text("SELECT 1 FROM corpus_state WHERE id = 1")).first() is None:
+            connection.execute(text("INSERT INTO corpus_state (id, generation) VALUES (1, 0)"))
+        if not rebuild and (
+            connection.execute(text("SELECT 1 FROM category_stats LIMIT 1")).first() is not None
+            or connection.execute(text("SELECT 1 FROM paper_categories LIMIT 1")).first() is None
+        ):
+            return
+        connection.execute(text("DELETE FROM category_stats"))
+        connection.execute(
+            text(
+                "INSERT INTO category_stats (category, paper_count, latest_published_at) "
+                "SELECT category, COUNT(*), MAX(published_at) FROM paper_categories GROUP BY category"
+            )
+        )
+        connection.execute(text("UPDATE corpus_state SET generation = generation + 1 WHERE id = 1"))
+
+
+def _ensure_search_index(engine: Any) -> None:
+    global _search_index_ready
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'")
+        ).first()
+    if exists is None:
+        try:
+            with engine.begin() as connection:
+                # the trailing 'rebuild' backfills rows stored before the index existed
+                for statement in _SEARCH_INDEX_DDL:
+                    connection.execute(text(statement))
+        except OperationalError:  # SQLite built without FTS5; search falls back to LIKE
+            _search_index_ready = False
+            return
+    _search_index_ready = True
+
+
+def search_index_available() -> bool:
+    return _search_index_ready
 
 
 def create_session() -> Session:
     if _SessionLocal is None:
         configure_engine()
     return _SessionLocal()  # type: ignore[return-value]
+
+
+def _get_db_executor() -> ThreadPoolExecutor | None:
+    global _db_executor
+    engine = get_engine()
+    # an in-memory SQLite database lives in one connection per thread, so stay inline
+    if settings.db_executor_workers <= 0 or _is_memory_url(str(engine.url)):
+        return None
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.db_executor_workers,
+            thread_name_prefix="paper-db",
+        )
+    return _db_executor
+
+
+def _call_with_session(operation: Callable[[Session], T]) -> T:
+    session = create_session()
+    try:
+        return operation(session)
+    finally:
+        session.close()
+
+
+async def run_in_session(operation: Callable[[Session], T]) -> T:
+    """Run blocking ``operation(session)`` on the DB thread pool so the event loop stays free."""
+
+    executor = _get_db_executor()
+    if executor is None:
+        return _call_with_session(operation)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _call_with_session, operation)
+
+
+def shutdown_db_executor() -> None:
+    global _db_executor
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=True, cancel_futures=True)
+        _db_executor = None
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+from .config import settings
+from .serialization import dumps
+
+PAPER_CREATED = "paper.created"
+PAPER_SUMMARIZED = "paper.summarized"
+RESET = "reset"
+
+HEARTBEAT = b": keepalive\n\n"
+
+
+@dataclass(slots=True)
+class PaperEvent:
+    id: int
+    type: str
+    data: dict[str, Any]
+    # encoded once and shared by every subscriber
+    frame: bytes = field(repr=False)
+
+
+def encode_frame(event_id: int, event_type: str, data: Any) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), dumps(data))
+
+
+class EventSubscription:
+    """One client's view of the broker: a replay backlog followed by a bounded live queue.
+
+    A client that falls ``buffer`` events behind is not allowed to grow memory; its
+    stream ends instead, and the client resumes with ``Last-Event-ID`` from the
+    broker's history.
+    """
+
+    def __init__(self, broker: EventBroker, loop: asyncio.AbstractEventLoop, buffer: int) -> None:
+        self._broker = broker
+        self._loop = loop
+        self._queue: asyncio.Queue[PaperEvent | None] = asyncio.Queue(maxsize=buffer)
+        self._backlog: list[bytes] = []
+        self._position = 0
+        self.lagging = False
+
+    def _offer(self, event: PaperEvent) -> None:
+        # runs on the subscriber's loop, in publish order
+        if self.lagging or event.id <= self._position:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagging = True
+        else:
+            self._position = event.id
+
+    def _finish(self) -> None:
+        self.lagging = True
+        if not self._queue.full():
+            self._queue.put_nowait(None)
+
+    def _schedule(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:  # the subscriber's loop is gone
+            self._broker._unsubscribe(self)
+
+    async def frames(self, *, heartbeat: float) -> AsyncIterator[bytes]:
+        """Yield encoded SSE frames; a comment line is sent after ``heartbeat`` idle seconds."""
+
+        for frame in self._backlog:
+            yield frame
+        self._backlog = []
+        while True:
+            if self.lagging and self._queue.empty():
+                return
+            try:
+                event = await asyncio.wait_for(self._queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if event is None:
+                return
+            yield event.frame
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+    def __enter__(self) -> EventSubscription:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class EventBroker:
+    """In-process pub/sub for paper changes with a bounded history for resumption.
+
+    ``publish`` is thread-safe and never blocks on slow subscribers. Event ids increase
+    monotonically for the lifetime of the process.
+    """
+
+    def __init__(self, *, history: int = 1000, client_buffer: int = 256) -> None:
+        self._history: deque[PaperEvent] = deque(maxlen=max(1, history))
+        self._client_buffer = max(1, client_buffer)
+        self._subscribers: set[EventSubscription] = set()
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> PaperEvent:
+        with self._lock:
+            self._last_id += 1
+            event = PaperEvent(
+                id=self._last_id, type=event_type, data=data, frame=encode_frame(self._last_id, event_type, data)
+            )
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._schedule(subscription._offer, event)
+        return event
+
+    def subscribe(self, last_event_id: int | None = None) -> EventSubscription:
+        """Register a subscriber on the running loop, replaying events after ``last_event_id``.
+
+        If those events are no longer in the history (or the id comes from an earlier
+        process), the client gets a ``reset`` event telling it to reload its lists.
+        """
+
+        subscription = EventSubscription(self, asyncio.get_running_loop(), self._client_buffer)
+        with self._lock:
+            # registering under the lock means no event lands between the replay and the queue
+            self._subscribers.add(subscription)
+            subscription._position = self._last_id
+            if last_event_id is None or last_event_id == self._last_id:
+                return subscription
+            oldest = self._history[0].id if self._history else self._last_id + 1
+            if last_event_id > self._last_id or last_event_id < oldest - 1:
+                subscription._backlog = [encode_frame(self._last_id, RESET, {"last_event_id": self._last_id})]
+            else:
+                subscription._backlog = [event.frame for event in self._history if event.id > last_event_id]
+        return subscription
+
+    def close_all(self) -> None:
+        """End every open stream, e.g. on shutdown so servers need not wait for them."""
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._schedule(subscription._finish)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+event_broker = EventBroker(history=settings.event_history_size, client_buffer=settings.event_client_buffer)
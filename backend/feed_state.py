@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from .models import FeedState
+from .scraper import FeedValidators
+from .timeutil import utcnow
+
+
+class FeedStateRepository:
+    """Database-backed validators for conditional feed requests.
+
+    New validators are staged in memory and only written by :meth:`save`, so a feed
+    is not marked as seen before its papers have been stored.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self._staged: dict[str, FeedValidators] = {}
+
+    def lookup(self, url: str) -> FeedValidators | None:
+        state = self.session.get(FeedState, url)
+        if state is None:
+            return None
+        return FeedValidators(
+            etag=state.etag,  # type: ignore[arg-type]
+            last_modified=state.last_modified,  # type: ignore[arg-type]
+            body_hash=state.body_hash,  # type: ignore[arg-type]
+        )
+
+    def remember(self, url: str, validators: FeedValidators) -> None:
+        self._staged[url] = validators
+
+    def save(self) -> None:
+        now = utcnow()
+        for url, validators in self._staged.items():
+            self.session.merge(
+                FeedState(
+                    url=url,
+                    etag=validators.etag,
+                    last_modified=validators.last_modified,
+                    body_hash=validators.body_hash,
+                    checked_at=now,
+                )
+            )
+        self._staged.clear()
+        self.session.commit()
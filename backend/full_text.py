@@ -1,42 +1,255 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from io import BytesIO
-from typing import List
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator, List
 
 import httpx
 from pypdf import PdfReader
 
 from .config import Settings
+from .http_client import get_http_client
+from .pdf_cache import get_pdf_cache
 
 ARXIV_PDF_BASE = "https://arxiv.org/pdf"
 
+logger = logging.getLogger(__name__)
 
-async def fetch_full_text(arxiv_id: str, pdf_url: str | None, settings: Settings) -> str:
-    """Download the paper PDF and extract machine-readable text."""
+# Headings after which a paper only carries references or appendices.
+_BACK_MATTER_HEADING = re.compile(
+    r"^[ \t]*(?:[A-Z0-9]{1,3}\.?[ \t]+)?(?:references|bibliography|appendix|appendices)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Ignore such headings until this much body text has been seen (tables of contents, etc.).
+_BACK_MATTER_MIN_CHARS = 2000
 
-    candidates = _build_candidate_urls(arxiv_id, pdf_url)
-    pdf_bytes: bytes | None = None
+_extraction_pool: ProcessPoolExecutor | None = None
+_extraction_pool_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class DownloadedPdf:
+    """A fetched PDF, either a file on disk or a spooled buffer; never a second in-memory copy."""
 
-    async with httpx.AsyncClient() as client:
-        for url in candidates:
+    path: Path | None = None
+    buffer: BinaryIO | None = None
+    owns_path: bool = False
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        if self.path is not None and self.owns_path:
             try:
-                response = await client.get(url, timeout=settings.request_timeout_seconds)
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "DownloadedPdf":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+async def download_pdf(
+    arxiv_id: str,
+    pdf_url: str | None,
+    settings: Settings,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> DownloadedPdf | None:
+    """Stream the PDF to disk (or a spooled buffer), serving it from the on-disk cache when possible."""
+
+    cache = get_pdf_cache(settings)
+    cached = cache.lookup(arxiv_id) if cache else None
+    if cache and cached and cached.immutable:
+        cache.touch(cached)
+        return DownloadedPdf(path=cached.path)
+
+    candidates = _build_candidate_urls(arxiv_id, pdf_url)
+    client = client or get_http_client()
+    for url in candidates:
+        headers = cached.validator_headers() if cached and cached.url == url else {}
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=settings.request_timeout_seconds,
+            ) as response:
+                if response.status_code == 304 and cache and cached:
+                    if cached.path.exists():
+                        cache.touch(cached)
+                        return DownloadedPdf(path=cached.path)
+                    continue
                 response.raise_for_status()
-            except httpx.HTTPError:
-                continue
-            content_type = response.headers.get("content-type", "")
-            if "pdf" not in content_type and not url.lower().endswith(".pdf"):
-                continue
-            pdf_bytes = response.content
-            if pdf_bytes:
-                break
-
-    if not pdf_bytes:
-        return ""
+                content_type = response.headers.get("content-type", "")
+                if "pdf" not in content_type and not url.lower().endswith(".pdf"):
+                    continue
+                declared = response.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > settings.pdf_max_bytes:
+                    # the other mirrors serve the same file; don't pay for it again
+                    logger.warning("Skipping %s: %s bytes exceeds the PDF size cap", url, declared)
+                    return None
+                document = await _receive_pdf(response, arxiv_id, url, settings)
+        except _OversizedPdf:
+            return None
+        except httpx.HTTPError:
+            continue
+        if document is not None:
+            return document
+    return None
+
+
+class _OversizedPdf(Exception):
+    """The body passed ``pdf_max_bytes``; final for the paper, not just for this URL."""
+
+
+async def _receive_pdf(
+    response: httpx.Response,
+    arxiv_id: str,
+    url: str,
+    settings: Settings,
+) -> DownloadedPdf | None:
+    cache = get_pdf_cache(settings)
+    temp_path: Path | None = None
+    if cache is not None:
+        sink, temp_path = cache.open_temp()
+    else:
+        sink = SpooledTemporaryFile(max_size=max(0, settings.pdf_spool_memory_bytes))
+
+    size = 0
+    try:
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > settings.pdf_max_bytes:
+                logger.warning("Aborting %s: body exceeds the PDF size cap", url)
+                raise _OversizedPdf(url)
+            sink.write(chunk)
+    except BaseException:
+        sink.close()
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
+        raise
+
+    if temp_path is None:
+        if not size:
+            sink.close()
+            return None
+        sink.seek(0)
+        return DownloadedPdf(buffer=sink)
+
+    sink.close()
+    if cache is None or not size:
+        temp_path.unlink(missing_ok=True)
+        return None
+    entry = cache.commit(
+        arxiv_id,
+        temp_path,
+        url=url,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+    if entry is None:
+        # larger than the whole cache budget: hand the temp file over and delete it after use
+        return DownloadedPdf(path=temp_path, owns_path=True)
+    return DownloadedPdf(path=entry.path)
+
+
+async def extract_pdf_text(document: DownloadedPdf, settings: Settings) -> str:
+    """Run the CPU-bound text extraction off the event loop.
+
+    With ``pdf_extract_workers`` > 0 the work goes to a dedicated process pool so
+    pypdf neither holds the GIL of the serving process nor blocks other requests.
+    Files on disk are handed to workers by path; only spooled buffers are copied.
+    """
 
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _pdf_bytes_to_text, pdf_bytes)
+    timeout = settings.pdf_extract_timeout_seconds or None
+    budget = full_text_char_budget(settings)
+    skip_back_matter = settings.full_text_skip_back_matter
+    for _ in range(2):
+        pool = _get_extraction_pool(settings)
+        source = _extraction_source(document, in_process=pool is None)
+        if source is None:
+            return ""
+        if pool is None:
+            return await asyncio.wait_for(
+                loop.run_in_executor(None, _pdf_to_text, source, budget, skip_back_matter),
+                timeout,
+            )
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, _pdf_to_text, source, budget, skip_back_matter),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            # the worker is stuck on a pathological PDF; kill it and start fresh for the next document
+            logger.warning("PDF text extraction timed out after %ss", timeout)
+            _discard_extraction_pool(pool)
+            return ""
+        except BrokenProcessPool:
+            # another document's timeout (or a crash) tore the pool down; retry once on a fresh pool
+            _discard_extraction_pool(pool)
+    return ""
+
+
+def _extraction_source(document: DownloadedPdf, *, in_process: bool) -> str | bytes | BinaryIO | None:
+    if document.path is not None:
+        return str(document.path)
+    if document.buffer is None:
+        return None
+    document.buffer.seek(0)
+    if in_process:
+        return document.buffer
+    # worker processes cannot share the buffer, so this is the one place a copy is made
+    return document.buffer.read()
+
+
+def _get_extraction_pool(settings: Settings) -> ProcessPoolExecutor | None:
+    global _extraction_pool
+    if settings.pdf_extract_workers <= 0:
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=settings.pdf_extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=settings.pdf_extract_max_tasks_per_child or None,
+            )
+        return _extraction_pool
+
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor) -> None:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the extraction workers; the pool is recreated lazily on next use."""
+
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 def _build_candidate_urls(arxiv_id: str, pdf_url: str | None) -> List[str]:
@@ -62,16 +275,47 @@ def _build_candidate_urls(arxiv_id: str, pdf_url: str | None) -> List[str]:
     return unique_urls
 
 
-def _pdf_bytes_to_text(payload: bytes) -> str:
-    if not payload:
+def full_text_char_budget(settings: Settings) -> int:
+    """Number of characters the summarizer can consume with the current chunk settings."""
+
+    chunk_size = max(1000, settings.full_text_chunk_chars)
+    overlap = max(0, min(settings.full_text_chunk_overlap, chunk_size // 2))
+    max_chunks = max(1, settings.full_text_max_chunks)
+    return chunk_size + (max_chunks - 1) * (chunk_size - overlap)
+
+
+def _iter_page_text(reader: PdfReader) -> Iterator[str]:
+    for page in reader.pages:
+        extracted = (page.extract_text() or "").strip()
+        if extracted:
+            yield extracted
+
+
+def _pdf_to_text(
+    source: str | bytes | BinaryIO,
+    max_chars: int = 0,
+    skip_back_matter: bool = False,
+) -> str:
+    if not source:
         return ""
+    fragments: List[str] = []
+    collected = 0
     try:
-        with BytesIO(payload) as buffer:
-            reader = PdfReader(buffer)
-            fragments: List[str] = []
-            for page in reader.pages:
-                extracted = page.extract_text() or ""
-                fragments.append(extracted.strip())
+        with PdfReader(BytesIO(source) if isinstance(source, bytes) else source) as reader:
+            # pages are parsed lazily, so stopping early skips the remaining pages entirely
+            for text in _iter_page_text(reader):
+                if skip_back_matter and collected >= _BACK_MATTER_MIN_CHARS:
+                    match = _BACK_MATTER_HEADING.search(text)
+                    if match:
+                        head = text[: match.start()].strip()
+                        if head:
+                            fragments.append(head)
+                        break
+                fragments.append(text)
+                collected += len(text) + 2
+                if max_chars and collected >= max_chars:
+                    break
     except Exception:
         return ""
-    return "\n\n".join(fragment for fragment in fragments if fragment)
+    document = "\n\n".join(fragments)
+    return document[:max_chars] if max_chars else document
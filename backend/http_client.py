@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import httpx
+
+from .config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientManager:
+    """Owns the application-wide pooled ``httpx.AsyncClient`` shared by scraper and full-text fetcher."""
+
+    def __init__(self, configuration: Settings) -> None:
+        self._settings = configuration
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # a client is bound to the loop it was created on (e.g. one asyncio.run per CLI call)
+            self._client = self._build_client()
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self._settings.http_max_connections,
+            max_keepalive_connections=self._settings.http_max_keepalive_connections,
+            keepalive_expiry=self._settings.http_keepalive_expiry_seconds,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=self._http2_available(),
+            timeout=self._settings.request_timeout_seconds,
+        )
+
+    def _http2_available(self) -> bool:
+        if not self._settings.http2_enabled:
+            return False
+        try:
+            import h2  # noqa: F401 -- optional dependency, installed via httpx[http2]
+        except ImportError:
+            logger.warning("PAPER_HTTP2_ENABLED is set but the 'h2' package is missing; using HTTP/1.1")
+            return False
+        return True
+
+
+_manager = HttpClientManager(settings)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    return _manager.get()
+
+
+async def close_http_client() -> None:
+    await _manager.aclose()
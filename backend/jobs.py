@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Iterable, List
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from .config import Settings, settings
+from .models import Paper, SummaryJob, SummaryJobAttempt
+from .timeutil import utcnow
+
+
+class SummaryJobQueue:
+    """Durable summarization work queue stored in the ``summary_jobs`` table.
+
+    ``enqueue``, ``complete`` and ``fail`` only stage changes so they commit together
+    with the caller's own writes; ``claim`` commits immediately so the lease is visible
+    to other workers.
+    """
+
+    def __init__(self, session: Session, configuration: Settings | None = None) -> None:
+        self.session = session
+        self.settings = configuration or settings
+
+    def enqueue(self, paper_ids: Iterable[int], *, priority: int = 0) -> int:
+        ids = list(dict.fromkeys(paper_ids))
+        if not ids:
+            return 0
+        now = utcnow()
+        existing = {
+            job.paper_id: job
+            for job in self.session.scalars(select(SummaryJob).where(SummaryJob.paper_id.in_(ids)))
+        }
+        enqueued = 0
+        for paper_id in ids:
+            job = existing.get(paper_id)
+            if job is None:
+                self.session.add(
+                    SummaryJob(
+                        paper_id=paper_id,
+                        status=SummaryJob.PENDING,
+                        priority=priority,
+                        attempts=0,
+                        available_at=now,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            elif job.status in (SummaryJob.DONE, SummaryJob.FAILED):
+                job.status = SummaryJob.PENDING  # type: ignore[assignment]
+                job.priority = priority  # type: ignore[assignment]
+                job.attempts = 0  # type: ignore[assignment]
+                job.available_at = now  # type: ignore[assignment]
+                job.last_error = None  # type: ignore[assignment]
+                job.updated_at = now  # type: ignore[assignment]
+            else:
+                continue
+            enqueued += 1
+        return enqueued
+
+    def enqueue_missing(self) -> int:
+        """Queue papers that still lack a summary and have no live job (e.g. ``llm-failed``/``not-run``)."""
+
+        stmt = (
+            select(Paper.id)
+            .outerjoin(SummaryJob, SummaryJob.paper_id == Paper.id)
+            .where(
+                or_(Paper.summary.is_(None), Paper.summary == ""),
+                Paper.abstract != "",
+                or_(SummaryJob.id.is_(None), SummaryJob.status == SummaryJob.DONE),
+            )
+        )
+        return self.enqueue(self.session.scalars(stmt).all())
+
+    def claim(self, owner: str, *, limit: int, paper_ids: Iterable[int] | None = None) -> List[SummaryJob]:
+        now = utcnow()
+        ready = or_(
+            and_(SummaryJob.status == SummaryJob.PENDING, SummaryJob.available_at <= now),
+            and_(SummaryJob.status == SummaryJob.RUNNING, SummaryJob.lease_expires_at < now),
+        )
+        stmt = (
+            select(SummaryJob.id)
+            .where(ready)
+            .order_by(SummaryJob.priority.desc(), SummaryJob.available_at)
+            .limit(max(1, limit))
+        )
+        if paper_ids is not None:
+            stmt = stmt.where(SummaryJob.paper_id.in_(list(paper_ids)))
+        lease_expires_at = now + timedelta(seconds=self.settings.summary_job_lease_seconds)
+        claimed: List[int] = []
+        for job_id in self.session.scalars(stmt).all():
+            # compare-and-set: only one worker can move a ready job into its lease
+            result = self.session.execute(
+                update(SummaryJob)
+                .where(SummaryJob.id == job_id, ready)
+                .values(
+                    status=SummaryJob.RUNNING,
+                    lease_owner=owner,
+                    lease_expires_at=lease_expires_at,
+                    claimed_at=now,
+                    attempts=SummaryJob.attempts + 1,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                claimed.append(job_id)
+        self.session.commit()
+        if not claimed:
+            return []
+        return list(
+            self.session.scalars(
+                select(SummaryJob)
+                .where(SummaryJob.id.in_(claimed))
+                .execution_options(populate_existing=True)
+            )
+        )
+
+    def heartbeat(self, owner: str, job_ids: Iterable[int]) -> int:
+        """Extend the lease on jobs ``owner`` still holds; returns how many were extended."""
+
+        ids = list(job_ids)
+        if not ids:
+            return 0
+        now = utcnow()
+        result = self.session.execute(
+            update(SummaryJob)
+            .where(
+                SummaryJob.id.in_(ids),
+                SummaryJob.status == SummaryJob.RUNNING,
+                SummaryJob.lease_owner == owner,
+            )
+            .values(
+                lease_expires_at=now + timedelta(seconds=self.settings.summary_job_lease_seconds),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount or 0
+
+    def release(self, owner: str) -> int:
+        """Hand every job ``owner`` still holds back to the queue without counting the attempt."""
+
+        now = utcnow()
+        result = self.session.execute(
+            update(SummaryJob)
+            .where(SummaryJob.status == SummaryJob.RUNNING, SummaryJob.lease_owner == owner)
+            .values(
+                status=SummaryJob.PENDING,
+                attempts=SummaryJob.attempts - 1,
+                available_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount or 0
+
+    def complete(self, job: SummaryJob, *, outcome: str = "succeeded") -> None:
+        self._record_attempt(job, outcome, None)
+        job.status = SummaryJob.DONE  # type: ignore[assignment]
+        job.last_error = None  # type: ignore[assignment]
+        self._release(job)
+
+    def fail(self, job: SummaryJob, error: str) -> None:
+        self._record_attempt(job, "failed", error)
+        job.last_error = error  # type: ignore[assignment]
+        if (job.attempts or 0) >= self.settings.summary_job_max_attempts:
+            job.status = SummaryJob.FAILED  # type: ignore[assignment]
+        else:
+            job.status = SummaryJob.PENDING  # type: ignore[assignment]
+            job.available_at = utcnow() + self._backoff(job.attempts or 1)  # type: ignore[assignment]
+        self._release(job)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = self.settings.summary_job_retry_base_seconds * (2 ** max(0, attempts - 1))
+        return timedelta(seconds=min(delay, self.settings.summary_job_retry_max_seconds))
+
+    def _release(self, job: SummaryJob) -> None:
+        job.lease_owner = None  # type: ignore[assignment]
+        job.lease_expires_at = None  # type: ignore[assignment]
+        job.updated_at = utcnow()  # type: ignore[assignment]
+
+    def _record_attempt(self, job: SummaryJob, outcome: str, error: str | None) -> None:
+        self.session.add(
+            SummaryJobAttempt(
+                job_id=job.id,
+                attempt=job.attempts or 0,
+                worker=job.lease_owner,
+                outcome=outcome,
+                error=error,
+                started_at=job.claimed_at,
+                finished_at=utcnow(),
+            )
+        )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .config import Settings
+from .database import create_session
+from .models import LLMCacheEntry
+from .timeutil import as_aware_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+# pending access records are written with the next put(), or once this many pile up
+_ACCESS_FLUSH_THRESHOLD = 256
+
+
+class LLMResponseCache:
+    """Content-addressed store of LLM completions kept in the application database."""
+
+    def __init__(
+        self,
+        *,
+        configuration: Settings,
+        session_factory: Callable[[], Session] = create_session,
+    ) -> None:
+        self._settings = configuration
+        self._session_factory = session_factory
+        self.hits = 0
+        self.misses = 0
+        # key -> (last access, hits) not yet written; hits stay off the write path
+        self._accessed: dict[str, tuple[datetime, int]] = {}
+        self._access_lock = threading.Lock()
+
+    @staticmethod
+    def build_key(model: str, base_url: str | None, prompt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, base_url or "", prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Read-only lookup; the access is recorded in memory and written by the next ``flush``."""
+
+        now = utcnow()
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                select(LLMCacheEntry.response, LLMCacheEntry.created_at).where(LLMCacheEntry.key == key)
+            ).first()
+        except SQLAlchemyError:
+            logger.warning("LLM cache lookup failed", exc_info=True)
+            self.misses += 1
+            return None
+        finally:
+            session.close()
+        if row is None or self._is_expired(row.created_at, now):
+            self.misses += 1
+            return None
+        with self._access_lock:
+            _, hits = self._accessed.get(key, (now, 0))
+            self._accessed[key] = (now, hits + 1)
+            backlog = len(self._accessed)
+        if backlog >= _ACCESS_FLUSH_THRESHOLD:
+            self.flush()
+        self.hits += 1
+        return str(row.response)
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = utcnow()
+        session = self._session_factory()
+        try:
+            entry = session.get(LLMCacheEntry, key)
+            if entry is None:
+                entry = LLMCacheEntry(key=key, model=model, hit_count=0)
+                session.add(entry)
+            entry.response = response  # type: ignore[assignment]
+            entry.created_at = now  # type: ignore[assignment]
+            entry.last_accessed_at = now  # type: ignore[assignment]
+            session.flush()
+            # eviction orders by last_accessed_at, so pending hits must land first
+            self._write_access(session)
+            self._evict(session, now)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            logger.warning("LLM cache write failed", exc_info=True)
+        finally:
+            session.close()
+
+    def flush(self) -> None:
+        """Write the access times and hit counts recorded since the last flush in one commit."""
+
+        session = self._session_factory()
+        try:
+            self._write_access(session)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            logger.warning("LLM cache access flush failed", exc_info=True)
+        finally:
+            session.close()
+
+    def _write_access(self, session: Session) -> None:
+        with self._access_lock:
+            accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+        table = LLMCacheEntry.__table__
+        session.execute(
+            update(table)
+            .where(table.c.key == bindparam("entry_key"))
+            .values(
+                last_accessed_at=bindparam("accessed_at"),
+                hit_count=func.coalesce(table.c.hit_count, 0) + bindparam("hits"),
+            ),
+            [
+                {"entry_key": key, "accessed_at": accessed_at, "hits": hits}
+                for key, (accessed_at, hits) in accessed.items()
+            ],
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _is_expired(self, created_at: datetime, now: datetime) -> bool:
+        ttl_hours = self._settings.llm_cache_ttl_hours
+        if ttl_hours <= 0:
+            return False
+        return now - as_aware_utc(created_at) > timedelta(hours=ttl_hours)
+
+    def _evict(self, session: Session, now: datetime) -> None:
+        ttl_hours = self._settings.llm_cache_ttl_hours
+        if ttl_hours > 0:
+            session.execute(
+                delete(LLMCacheEntry).where(LLMCacheEntry.created_at < now - timedelta(hours=ttl_hours))
+            )
+        max_entries = self._settings.llm_cache_max_entries
+        if max_entries <= 0:
+            return
+        count = session.scalar(select(func.count()).select_from(LLMCacheEntry)) or 0
+        overflow = count - max_entries
+        if overflow <= 0:
+            return
+        stale_keys = select(LLMCacheEntry.key).order_by(LLMCacheEntry.last_accessed_at.asc()).limit(overflow)
+        session.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(stale_keys)))
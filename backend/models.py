@@ -1,17 +1,55 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import hashlib
+import re
+from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
 
 from .database import Base
+from .timeutil import utcnow
+
+_VERSION_SUFFIX = re.compile(r"v(\d+)$")
+
+
+def split_arxiv_id(arxiv_id: str) -> tuple[str, int]:
+    """``2401.00001v2`` -> ``("2401.00001", 2)``; an id without a suffix counts as version 1."""
+
+    match = _VERSION_SUFFIX.search(arxiv_id)
+    if match is None:
+        return arxiv_id, 1
+    return arxiv_id[: match.start()], int(match.group(1))
+
+
+def abstract_fingerprint(abstract: str | None) -> str:
+    """Hash of the abstract with whitespace collapsed, so re-wrapped text is not a revision."""
+
+    return hashlib.sha256(" ".join((abstract or "").split()).encode("utf-8")).hexdigest()
+
+
+def _default_base_id(context: Any) -> str:
+    return split_arxiv_id(context.get_current_parameters()["arxiv_id"])[0]
+
+
+def _default_version(context: Any) -> int:
+    return split_arxiv_id(context.get_current_parameters()["arxiv_id"])[1]
+
+
+def _default_abstract_hash(context: Any) -> str:
+    return abstract_fingerprint(context.get_current_parameters()["abstract"])
 
 
 class Paper(Base):
     __tablename__ = "papers"
 
     id = Column(Integer, primary_key=True, index=True)
+    # latest versioned id seen, e.g. 2401.00001v2; one row per paper across its revisions
     arxiv_id = Column(String(50), unique=True, index=True, nullable=False)
+    base_id = Column(String(50), unique=True, index=True, nullable=False, default=_default_base_id)
+    version = Column(Integer, nullable=False, default=_default_version)
+    abstract_hash = Column(String(64), nullable=True, default=_default_abstract_hash)
+    # abstract_hash the current summary was written from; differs after a real revision
+    summary_abstract_hash = Column(String(64), nullable=True)
     title = Column(String(500), nullable=False)
     authors = Column(Text, nullable=False)
     author_affiliations = Column(Text, nullable=True)
@@ -27,18 +65,151 @@ class Paper(Base):
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     last_summarized_at = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # keyset pagination order for the unfiltered listing
+        Index("ix_papers_published_at_id", published_at.desc(), id.desc()),
+    )
+
     def category_list(self) -> list[str]:
-        return [item.strip() for item in self.categories.split(",") if item.strip()]
+        return split_categories(self.categories)  # type: ignore[arg-type]
 
     def author_list(self) -> list[str]:
-        return [item.strip() for item in self.authors.split(";") if item.strip()]
+        return split_authors(self.authors)  # type: ignore[arg-type]
 
     def affiliation_list(self) -> list[str]:
-        value = self.author_affiliations or ""
-        return [item.strip() for item in value.split(";") if item.strip()]
+        return split_authors(self.author_affiliations)  # type: ignore[arg-type]
 
     def mark_summarized(self, summary: str, model: str, language: str | None = None) -> None:
         self.summary = summary
         self.summary_model = model
         self.summary_language = language
-        self.last_summarized_at = datetime.now(timezone.utc)
+        self.last_summarized_at = utcnow()
+        self.summary_abstract_hash = self.abstract_hash
+
+    def summary_is_current(self) -> bool:
+        """True if there is a summary and it was not written for an earlier abstract revision."""
+
+        if not (self.summary or "").strip():
+            return False
+        # summaries stored without a hash predate version tracking and count as current
+        return self.summary_abstract_hash is None or self.summary_abstract_hash == self.abstract_hash
+
+
+class PaperCategory(Base):
+    """One row per (paper, category) so category listings can use an index instead of LIKE."""
+
+    __tablename__ = "paper_categories"
+
+    paper_id = Column(Integer, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(50), primary_key=True)
+    # copied from papers.published_at so filter, order and count stay inside the index
+    published_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_paper_categories_category_published",
+            "category",
+            published_at.desc(),
+            paper_id.desc(),
+        ),
+    )
+
+
+class CategoryStat(Base):
+    """Per-category paper count and newest publish date, maintained incrementally on ingest."""
+
+    __tablename__ = "category_stats"
+
+    category = Column(String(50), primary_key=True)
+    paper_count = Column(Integer, nullable=False, default=0)
+    latest_published_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class CorpusState(Base):
+    """Single-row counter bumped whenever the stored corpus changes; caches key on it."""
+
+    __tablename__ = "corpus_state"
+
+    id = Column(Integer, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+def split_categories(value: str | None) -> list[str]:
+    seen: dict[str, None] = {}
+    for item in (value or "").split(","):
+        if item.strip():
+            seen.setdefault(item.strip(), None)
+    return list(seen)
+
+
+def split_authors(value: str | None) -> list[str]:
+    # authors and affiliations are positional, so unlike categories nothing is deduplicated
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    hit_count = Column(Integer, nullable=False, default=0)
+
+
+class FeedState(Base):
+    __tablename__ = "feed_states"
+
+    url = Column(String(500), primary_key=True)
+    etag = Column(String(200), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    body_hash = Column(String(64), nullable=True)
+    checked_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class SummaryJob(Base):
+    __tablename__ = "summary_jobs"
+    __table_args__ = (Index("ix_summary_jobs_ready", "status", "priority", "available_at"),)
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    id = Column(Integer, primary_key=True)
+    paper_id = Column(Integer, ForeignKey("papers.id", ondelete="CASCADE"), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default=PENDING)
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    lease_owner = Column(String(200), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class SummaryJobAttempt(Base):
+    __tablename__ = "summary_job_attempts"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("summary_jobs.id", ondelete="CASCADE"), index=True, nullable=False)
+    attempt = Column(Integer, nullable=False)
+    worker = Column(String(200), nullable=True)
+    outcome = Column(String(20), nullable=False)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class CoordinationLease(Base):
+    __tablename__ = "coordination_leases"
+
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(200), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    acquired_at = Column(DateTime(timezone=True), nullable=True)
+    last_result = Column(Text, nullable=True)
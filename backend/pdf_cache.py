@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+_STALE_TEMP_SECONDS = 3600
+
+
+@dataclass(slots=True)
+class CachedPdf:
+    path: Path
+    url: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def immutable(self) -> bool:
+        """Versioned arXiv PDFs never change, so they need no revalidation."""
+
+        return bool(_VERSION_SUFFIX.search(self.path.stem))
+
+    def validator_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PdfCache:
+    """On-disk PDF store keyed by arXiv id (including version) with an LRU byte budget."""
+
+    def __init__(self, directory: str | Path, *, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def lookup(self, arxiv_id: str) -> CachedPdf | None:
+        path = self._pdf_path(arxiv_id)
+        if not path.exists():
+            return None
+        metadata: dict[str, str | None] = {}
+        try:
+            metadata = json.loads(self._meta_path(arxiv_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        return CachedPdf(
+            path=path,
+            url=metadata.get("url"),
+            etag=metadata.get("etag"),
+            last_modified=metadata.get("last_modified"),
+        )
+
+    def touch(self, entry: CachedPdf) -> None:
+        # explicit nanosecond stamps: filesystem clocks are too coarse to order rapid accesses
+        now = time.time_ns()
+        try:
+            os.utime(entry.path, ns=(now, now))
+        except OSError:
+            pass
+
+    def open_temp(self) -> tuple[BinaryIO, Path]:
+        """Open a temp file inside the cache directory for streaming a download into."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".part")
+        return os.fdopen(handle, "wb"), Path(temp_name)
+
+    def commit(
+        self,
+        arxiv_id: str,
+        temp_path: Path,
+        *,
+        url: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CachedPdf | None:
+        """Atomically move a completed temp file into place; ``None`` if it does not fit the budget."""
+
+        try:
+            if temp_path.stat().st_size > self.max_bytes:
+                return None
+            metadata = {"url": url, "etag": etag, "last_modified": last_modified}
+            self._atomic_write(self._meta_path(arxiv_id), json.dumps(metadata).encode("utf-8"))
+            # rename within one directory is atomic, so readers never observe partial files
+            os.replace(temp_path, self._pdf_path(arxiv_id))
+        except OSError:
+            logger.warning("Unable to cache PDF for %s", arxiv_id, exc_info=True)
+            return None
+        entry = CachedPdf(path=self._pdf_path(arxiv_id), url=url, etag=etag, last_modified=last_modified)
+        self.touch(entry)
+        self.evict()
+        return entry
+
+    def evict(self) -> None:
+        self._remove_stale_temp_files()
+        entries: list[tuple[int, int, Path]] = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by a concurrent worker
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for victim in (path, path.with_suffix(".json")):
+                try:
+                    victim.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def _remove_stale_temp_files(self) -> None:
+        # leftovers from workers that died mid-download
+        cutoff = time.time() - _STALE_TEMP_SECONDS
+        for path in self.directory.glob(".tmp-*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _pdf_path(self, arxiv_id: str) -> Path:
+        return self.directory / f"{self._key(arxiv_id)}.pdf"
+
+    def _meta_path(self, arxiv_id: str) -> Path:
+        return self.directory / f"{self._key(arxiv_id)}.json"
+
+    @staticmethod
+    def _key(arxiv_id: str) -> str:
+        return _UNSAFE_CHARS.sub("_", arxiv_id.strip()) or "_"
+
+    def _atomic_write(self, target: Path, payload: bytes) -> None:
+        handle, temp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=target.suffix)
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(payload)
+            os.replace(temp_name, target)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+@lru_cache
+def _cache_for(directory: str, max_bytes: int) -> PdfCache:
+    return PdfCache(directory, max_bytes=max_bytes)
+
+
+def get_pdf_cache(configuration: Settings) -> PdfCache | None:
+    if configuration.pdf_cache_max_bytes <= 0 or not configuration.pdf_cache_dir:
+        return None
+    return _cache_for(configuration.pdf_cache_dir, configuration.pdf_cache_max_bytes)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from .coordination import RefreshCoordinator
+from .schemas import RefreshJobOut
+from .service import ProgressReporter, RefreshStats
+from .timeutil import utcnow
+
+logger = logging.getLogger(__name__)
+
+RefreshRunner = Callable[[ProgressReporter], Awaitable[RefreshStats]]
+
+
+@dataclass(slots=True)
+class RefreshJob:
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    id: str
+    stats: RefreshStats = field(default_factory=RefreshStats)
+    status: str = PENDING
+    current: int = 0
+    total: int = 0
+    error: str | None = None
+    created_at: datetime = field(default_factory=utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in (self.PENDING, self.RUNNING)
+
+    def report(self, current: int, total: int, stats: RefreshStats, paper: object) -> None:
+        # ProgressReporter hook; ``stats`` is the live object the refresh keeps mutating.
+        self.current = current
+        self.total = total
+        self.stats = stats
+
+    def to_response(self) -> RefreshJobOut:
+        return RefreshJobOut(
+            id=self.id,
+            status=self.status,
+            current=self.current,
+            total=self.total,
+            stats=self.stats.to_response(),
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class RefreshJobRegistry:
+    """Runs refreshes as background tasks and keeps their progress for polling.
+
+    Starting a job while another is active returns the active one, and every run
+    goes through the ``RefreshCoordinator`` so it never overlaps another refresh.
+    """
+
+    def __init__(
+        self,
+        coordinator: RefreshCoordinator,
+        runner: RefreshRunner,
+        *,
+        on_finish: Callable[[RefreshJob], None] | None = None,
+        history: int = 20,
+    ) -> None:
+        self._coordinator = coordinator
+        self._runner = runner
+        self._on_finish = on_finish
+        self._history = max(1, history)
+        self._jobs: OrderedDict[str, RefreshJob] = OrderedDict()
+
+    def start(self) -> RefreshJob:
+        for job in reversed(self._jobs.values()):
+            if job.active:
+                return job
+        job = RefreshJob(id=uuid.uuid4().hex)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self._history:
+            self._jobs.popitem(last=False)
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> RefreshJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> RefreshJob | None:
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return job
+        if job.status == RefreshJob.PENDING:
+            # the task has not started yet, so ``_run`` will never record the outcome
+            job.status = RefreshJob.CANCELLED
+            job.finished_at = utcnow()
+        else:
+            self._coordinator.cancel()
+        if job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def _run(self, job: RefreshJob) -> None:
+        job.status = RefreshJob.RUNNING
+        job.started_at = utcnow()
+        try:
+            stats = await self._coordinator.run(lambda: self._runner(job.report))
+        except asyncio.CancelledError:
+            job.status = RefreshJob.CANCELLED
+        except Exception as exc:
+            logger.exception("Refresh job %s failed", job.id)
+            job.status = RefreshJob.FAILED
+            job.error = str(exc) or exc.__class__.__name__
+        else:
+            job.status = RefreshJob.SUCCEEDED
+            if stats is not None:
+                job.stats = stats
+        finally:
+            job.finished_at = utcnow()
+        if self._on_finish is not None:
+            self._on_finish(job)
+
+    async def wait(self, job: RefreshJob) -> RefreshJob:
+        if job.task is not None:
+            await asyncio.wait({job.task})
+        return job
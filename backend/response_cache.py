@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable
+
+
+@dataclass(slots=True, frozen=True)
+class CachedBody:
+    body: bytes
+    media_type: str
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """Strong validator of the bytes alone, so unchanged pages keep it across corpus generations."""
+
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison function (RFC 9110 §13.1.2)
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ResponseCache:
+    """Bounded LRU of rendered read-API responses.
+
+    Keys include the corpus generation, so a refresh or summary commit makes older
+    entries unreachable and LRU eviction reclaims them; no explicit purge is needed.
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[Hashable, CachedBody] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedBody) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 
+from .models import split_authors, split_categories
+
 
 class PaperOut(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -33,27 +35,21 @@ class PaperOut(BaseModel):
     def _parse_authors(cls, value: List[str] | str | None) -> List[str]:
         if isinstance(value, list):
             return value
-        if not value:
-            return []
-        return [item.strip() for item in value.split(";") if item.strip()]
+        return split_authors(value)
 
     @field_validator("categories", mode="before")
     @classmethod
     def _parse_categories(cls, value: List[str] | str | None) -> List[str]:
         if isinstance(value, list):
             return value
-        if not value:
-            return []
-        return [item.strip() for item in value.split(",") if item.strip()]
+        return split_categories(value)
 
     @field_validator("affiliations", mode="before")
     @classmethod
     def _parse_affiliations(cls, value: List[str] | str | None) -> List[str]:
         if isinstance(value, list):
             return value
-        if not value:
-            return []
-        return [item.strip() for item in value.split(";") if item.strip()]
+        return split_authors(value)
 
     @field_serializer("authors")
     def _serialize_authors(self, authors: List[str]) -> List[str]:
@@ -70,10 +66,46 @@ class PaperOut(BaseModel):
 
 class PaginatedPapers(BaseModel):
     items: List[PaperOut]
-    total: int
+    # None when the caller skipped the count (cursor pages default to skipping it)
+    total: int | None = None
+    next_cursor: str | None = None
+
+
+class CategoryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    category: str
+    paper_count: int
+    latest_published_at: datetime | None = None
+
+
+class SearchHit(PaperOut):
+    # HTML-escaped excerpt with matches wrapped in <mark>; None on the LIKE fallback
+    snippet: str | None = None
+    score: float | None = None
+
+
+class SearchResults(BaseModel):
+    query: str
+    items: List[SearchHit]
 
 
 class RefreshResponse(BaseModel):
     fetched: int
     created: int
     summarized: int
+    enqueued: int = 0
+    revised: int = 0
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class RefreshJobOut(BaseModel):
+    id: str
+    status: str
+    current: int = 0
+    total: int = 0
+    stats: RefreshResponse
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, cast
+from typing import Iterable, List, Optional, Protocol, cast
 
 import time
 
@@ -12,6 +13,7 @@ import httpx
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from .config import settings
+from .http_client import get_http_client
 
 ARXIV_RSS_BASE = "https://rss.arxiv.org/rss"
 
@@ -30,6 +32,27 @@ class ScrapedPaper:
     updated_at: datetime
 
 
+@dataclass(slots=True)
+class FeedValidators:
+    etag: str | None = None
+    last_modified: str | None = None
+    body_hash: str | None = None
+
+    def request_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FeedStateStore(Protocol):
+    def lookup(self, url: str) -> FeedValidators | None: ...
+
+    def remember(self, url: str, validators: FeedValidators) -> None: ...
+
+
 def _parse_datetime(entry: feedparser.FeedParserDict, fallback: datetime | None = None) -> datetime:
     struct_time = entry.get("published_parsed") or entry.get("updated_parsed")
     if isinstance(struct_time, time.struct_time):
@@ -95,8 +118,16 @@ async def fetch_category(
     *,
     max_results: int,
     client: httpx.AsyncClient,
+    feed_state: FeedStateStore | None = None,
 ) -> List[ScrapedPaper]:
+    """Fetch and parse one category feed.
+
+    With ``feed_state`` the request is conditional, and an unchanged feed (304 or same
+    body hash) yields no papers so callers skip all downstream work for it.
+    """
+
     url = f"{ARXIV_RSS_BASE}/{category}"
+    previous = feed_state.lookup(url) if feed_state is not None else None
 
     async for attempt in AsyncRetrying(
         wait=wait_exponential(multiplier=1, min=1, max=10),
@@ -105,11 +136,30 @@ async def fetch_category(
         retry=retry_if_exception_type(httpx.HTTPError),
     ):
         with attempt:
-            response = await client.get(url, timeout=settings.request_timeout_seconds)
+            response = await client.get(
+                url,
+                headers=previous.request_headers() if previous else None,
+                timeout=settings.request_timeout_seconds,
+            )
+            if response.status_code == 304 and previous is not None:
+                return []
             response.raise_for_status()
+            body_hash = hashlib.sha256(response.content).hexdigest()
+            if previous is not None and previous.body_hash == body_hash:
+                return []
             parsed = feedparser.parse(response.text)
             entries = (parsed.get("entries") or [])[:max_results]
-            return [_parse_entry(entry) for entry in entries]
+            papers = [_parse_entry(entry) for entry in entries]
+            if feed_state is not None:
+                feed_state.remember(
+                    url,
+                    FeedValidators(
+                        etag=response.headers.get("etag"),
+                        last_modified=response.headers.get("last-modified"),
+                        body_hash=body_hash,
+                    ),
+                )
+            return papers
 
     return []
 
@@ -118,10 +168,15 @@ async def fetch_all_categories(
     categories: Iterable[str],
     *,
     max_results: int,
+    client: httpx.AsyncClient | None = None,
+    feed_state: FeedStateStore | None = None,
 ) -> List[ScrapedPaper]:
-    async with httpx.AsyncClient() as client:
-        tasks = [fetch_category(category, max_results=max_results, client=client) for category in categories]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    client = client or get_http_client()
+    tasks = [
+        fetch_category(category, max_results=max_results, client=client, feed_state=feed_state)
+        for category in categories
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
     papers: List[ScrapedPaper] = []
     for result in results:
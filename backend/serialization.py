@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+
+def dumps(value: Any) -> bytes:
+    """Encode plain dict/list payloads to compact UTF-8 JSON, byte-compatible with Pydantic output."""
+
+    # OPT_UTC_Z renders UTC-aware datetimes with "Z", as Pydantic does
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)
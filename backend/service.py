@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Iterable, List
+import asyncio
+import base64
+import binascii
+import html
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, text, tuple_
 from sqlalchemy.orm import Session
 
+from .catalog import apply_category_changes, bump_generation, category_catalog
 from .config import Settings, settings
-from .full_text import fetch_full_text
-from .models import Paper
-from .schemas import PaginatedPapers, PaperOut, RefreshResponse
+from .database import search_index_available
+from .events import PAPER_CREATED, PAPER_SUMMARIZED, event_broker
+from .feed_state import FeedStateRepository
+from .full_text import download_pdf, extract_pdf_text
+from .jobs import SummaryJobQueue
+from .models import Paper, PaperCategory, abstract_fingerprint, split_arxiv_id, split_authors, split_categories
+from .schemas import (
+    CategoryOut,
+    PaginatedPapers,
+    PaperOut,
+    RefreshResponse,
+    SearchHit,
+    SearchResults,
+)
 from .scraper import ScrapedPaper, fetch_all_categories
 from .summarizer import Summarizer, get_summarizer
+from .timeutil import as_naive_utc
 
 
 @dataclass(slots=True)
@@ -20,14 +40,210 @@ class RefreshStats:
     fetched: int = 0
     created: int = 0
     summarized: int = 0
+    enqueued: int = 0
+    # known papers whose new arXiv version changed the abstract; re-summarized at low priority
+    revised: int = 0
+    # wall-clock seconds per finished stage: scrape, ingest, summarize
+    timings: dict[str, float] = field(default_factory=dict)
 
     def to_response(self) -> RefreshResponse:
-        return RefreshResponse(fetched=self.fetched, created=self.created, summarized=self.summarized)
+        return RefreshResponse(
+            fetched=self.fetched,
+            created=self.created,
+            summarized=self.summarized,
+            enqueued=self.enqueued,
+            revised=self.revised,
+            timings=dict(self.timings),
+        )
+
+    def record_stage(self, stage: str, started: float) -> None:
+        self.timings[stage] = round(time.perf_counter() - started, 3)
+
+
+@dataclass(slots=True)
+class SummaryRequest:
+    """The fields the summarization pipeline needs, detached from the ORM session."""
+
+    arxiv_id: str
+    title: str
+    abstract: str
+    pdf_url: str | None
+
+    @classmethod
+    def from_paper(cls, paper: Paper) -> "SummaryRequest":
+        return cls(
+            arxiv_id=str(paper.arxiv_id),
+            title=str(paper.title),
+            abstract=str(paper.abstract),
+            pdf_url=paper.pdf_url,  # type: ignore[arg-type]
+        )
 
 
 ProgressReporter = Callable[[int, int, RefreshStats, ScrapedPaper | None], None]
 
 
+@dataclass(slots=True)
+class _PipelineSlots:
+    """Per-stage concurrency limits for the summarization pipeline."""
+
+    fetch: asyncio.Semaphore
+    extract: asyncio.Semaphore
+    summarize: asyncio.Semaphore
+
+    @classmethod
+    def from_settings(cls, configuration: Settings) -> "_PipelineSlots":
+        return cls(
+            fetch=asyncio.Semaphore(max(1, configuration.full_text_fetch_concurrency)),
+            extract=asyncio.Semaphore(max(1, configuration.full_text_extract_concurrency)),
+            summarize=asyncio.Semaphore(max(1, configuration.summary_concurrency)),
+        )
+
+
+@dataclass(slots=True)
+class _StoredBatch:
+    entities: dict[str, Paper]
+    created: set[str]
+    needs_summary: set[str]
+    enqueued: int = 0
+    revised: int = 0
+
+
+# Scraped columns refreshed on re-ingest; published_at keeps its first-seen value.
+_UPDATABLE_FIELDS = (
+    "arxiv_id",
+    "version",
+    "abstract_hash",
+    "title",
+    "authors",
+    "author_affiliations",
+    "abstract",
+    "categories",
+    "link",
+    "pdf_url",
+    "updated_at",
+)
+
+
+def _newest_revisions(batch: Sequence[ScrapedPaper]) -> list[ScrapedPaper]:
+    """One scraped paper per base id, the highest version, in first-seen order."""
+
+    newest: dict[str, ScrapedPaper] = {}
+    for paper in batch:
+        base_id, version = split_arxiv_id(paper.arxiv_id)
+        seen = newest.get(base_id)
+        if seen is None or version > split_arxiv_id(seen.arxiv_id)[1]:
+            newest[base_id] = paper
+    return list(newest.values())
+
+
+def _dialect_insert(dialect_name: str) -> Callable[..., Any] | None:
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name in {"mysql", "mariadb"}:
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        return None
+    return insert
+
+
+# Private-use sentinels let snippet() mark matches before the text is HTML-escaped.
+_MATCH_OPEN, _MATCH_CLOSE = "\ue000", "\ue001"
+_SEARCH_TERM = re.compile(r"\w[\w.+-]*", re.UNICODE)
+
+
+def _search_terms(query: str) -> list[str]:
+    return _SEARCH_TERM.findall(query)[:16]
+
+
+def _fts_match_expression(terms: Sequence[str]) -> str:
+    # Quote every term so user input can never inject FTS5 operators; the last one
+    # is a prefix match to support search-as-you-type.
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _render_snippet(value: str | None) -> str | None:
+    if not value:
+        return None
+    escaped = html.escape(value)
+    return escaped.replace(_MATCH_OPEN, "<mark>").replace(_MATCH_CLOSE, "</mark>")
+
+
+def _comparable(value: object) -> object:
+    return as_naive_utc(value) if isinstance(value, datetime) else value
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(published_at: datetime, paper_id: int) -> str:
+    raw = json.dumps([published_at.isoformat(), paper_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_at, paper_id = json.loads(raw)
+        return datetime.fromisoformat(published_at), int(paper_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+class InvalidProjection(ValueError):
+    """Raised when ``fields=`` names something that is not a paper field."""
+
+
+# Public PaperOut field -> (column, decoder) for ``fields=`` projections.
+_PROJECTABLE_FIELDS: dict[str, tuple[Any, Callable[[Any], Any] | None]] = {
+    "arxiv_id": (Paper.arxiv_id, None),
+    "title": (Paper.title, None),
+    "authors": (Paper.authors, split_authors),
+    "affiliations": (Paper.author_affiliations, split_authors),
+    "abstract": (Paper.abstract, None),
+    "summary": (Paper.summary, None),
+    "summary_model": (Paper.summary_model, None),
+    "summary_language": (Paper.summary_language, None),
+    "categories": (Paper.categories, split_categories),
+    "link": (Paper.link, None),
+    "pdf_url": (Paper.pdf_url, None),
+    "published_at": (Paper.published_at, None),
+    "updated_at": (Paper.updated_at, None),
+    "last_summarized_at": (Paper.last_summarized_at, None),
+}
+
+
+def _project_row(row: Any, fields: Sequence[str]) -> dict[str, Any]:
+    item: dict[str, Any] = {}
+    for field in fields:
+        value = getattr(row, field)
+        decoder = _PROJECTABLE_FIELDS[field][1]
+        item[field] = decoder(value) if decoder is not None else value
+    return item
+
+
+def _event_data(entity: Paper) -> dict[str, Any]:
+    """Event payload for a paper: the list view's fields (the abstract is fetched on demand)."""
+
+    return PaperOut.model_validate(entity).model_dump(by_alias=True, exclude={"abstract"})
+
+
+def parse_fields(value: str | None) -> tuple[str, ...] | None:
+    """Parse a comma-separated ``fields=`` value; ``None`` means the full paper."""
+
+    if value is None or not value.strip():
+        return None
+    fields = tuple(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+    unknown = [field for field in fields if field not in _PROJECTABLE_FIELDS]
+    if unknown:
+        raise InvalidProjection(", ".join(unknown))
+    return fields
+
+
 class PaperService:
     def __init__(
         self,
@@ -44,88 +260,298 @@ class PaperService:
         *,
         categories: Iterable[str] | None = None,
         progress: ProgressReporter | None = None,
+        drain: bool = True,
     ) -> RefreshStats:
+        """Scrape, store metadata and queue summary jobs.
+
+        With ``drain`` the queued jobs are worked off before returning; otherwise the
+        call returns once metadata is stored and a ``SummaryWorker`` picks them up.
+        """
+
         categories = list(categories or self.settings.arxiv_categories)
+        feed_state = FeedStateRepository(self.session) if self.settings.feed_conditional_requests else None
+        started = time.perf_counter()
         scraped: List[ScrapedPaper] = await fetch_all_categories(
             categories,
             max_results=self.settings.max_results_per_category,
+            feed_state=feed_state,
         )
+        # several versions of one paper map to one row; keep the newest so progress counts papers
+        scraped = _newest_revisions(scraped)
         stats = RefreshStats(fetched=len(scraped))
+        stats.record_stage("scrape", started)
         total = len(scraped)
+        completed = 0
         self._emit_progress(progress, 0, total, stats, None)
-        for index, paper in enumerate(scraped, start=1):
-            existing = self._get_by_arxiv_id(paper.arxiv_id)
-            if existing is None:
-                entity = self._create_entity(paper)
-                created = True
-            else:
-                entity = existing
-                created = False
-                self._update_existing(entity, paper)
-
-            summarized = await self._summarize_if_needed(entity, paper)
-
-            if created:
-                self.session.add(entity)
-
-            try:
-                self.session.commit()
-            except IntegrityError:
-                self.session.rollback()
-                existing = self._get_by_arxiv_id(paper.arxiv_id)
-                if existing is None:
-                    entity = self._create_entity(paper)
-                    created = True
-                    summarized = await self._summarize_if_needed(entity, paper)
-                    self.session.add(entity)
-                else:
-                    entity = existing
-                    created = False
-                    self._update_existing(entity, paper)
-                    summarized = await self._summarize_if_needed(entity, paper)
-                self.session.commit()
 
-            if created:
-                stats.created += 1
+        started = time.perf_counter()
+        queued: dict[int, ScrapedPaper] = {}
+        batch_size = max(1, self.settings.refresh_batch_size)
+        for start in range(0, total, batch_size):
+            batch = scraped[start : start + batch_size]
+            stored = self._store_metadata(batch)
+            stats.created += len(stored.created)
+            stats.enqueued += stored.enqueued
+            stats.revised += stored.revised
+            for paper in batch:
+                if paper.arxiv_id in stored.needs_summary:
+                    queued[stored.entities[paper.arxiv_id].id] = paper  # type: ignore[index]
+                    if drain:
+                        continue
+                completed += 1
+                self._emit_progress(progress, completed, total, stats, paper)
+        if feed_state is not None:
+            feed_state.save()
+        stats.record_stage("ingest", started)
+
+        if not queued or not drain:
+            return stats
+
+        from .worker import SummaryWorker
+
+        def record(entity: Paper, summarized: bool) -> None:
+            nonlocal completed
             if summarized:
                 stats.summarized += 1
-            self._emit_progress(progress, index, total, stats, paper)
+            completed += 1
+            self._emit_progress(progress, completed, total, stats, queued.get(entity.id))  # type: ignore[arg-type]
+
+        started = time.perf_counter()
+        await SummaryWorker(self.session, service=self).drain(paper_ids=list(queued), on_result=record)
+        stats.record_stage("summarize", started)
         return stats
 
-    def list_papers(self, *, category: str | None, limit: int, offset: int = 0) -> PaginatedPapers:
-        filters = []
-        if category:
-            filters.append(Paper.categories.like(f"%{category}%"))
-        total = (
-            self.session.scalar(select(func.count()).select_from(Paper).where(*filters))
-            or 0
+    async def summarize_papers(
+        self,
+        entities: Sequence[Paper],
+        *,
+        on_result: Callable[[Paper, bool], None] | None = None,
+    ) -> int:
+        """Run fetch → extract → summarize for ``entities`` and commit each result as it lands."""
+
+        if not entities:
+            return 0
+        slots = _PipelineSlots.from_settings(self.settings)
+        tasks = {
+            asyncio.create_task(self._summarize_paper(SummaryRequest.from_paper(entity), slots)): entity
+            for entity in entities
+        }
+        remaining: set[asyncio.Task[str]] = set(tasks)
+        summarized = 0
+        try:
+            while remaining:
+                done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # Results are persisted here only, so the session keeps a single writer.
+                    entity = tasks[task]
+                    succeeded = self._apply_summary(entity, task.result())
+                    if succeeded:
+                        summarized += 1
+                    if on_result is not None:
+                        on_result(entity, succeeded)
+                    # built before the commit expires the entity
+                    event = _event_data(entity) if succeeded else None
+                    bump_generation(self.session)
+                    self.session.commit()
+                    if event is not None:
+                        event_broker.publish(PAPER_SUMMARIZED, event)
+        finally:
+            for task in remaining:
+                task.cancel()
+            if self.summarizer.cache is not None:
+                # one batched write for the cache hits recorded during this batch
+                self.summarizer.cache.flush()
+        return summarized
+
+    def list_papers(
+        self,
+        *,
+        category: str | None,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+    ) -> PaginatedPapers:
+        """Page through papers newest first.
+
+        ``cursor`` (the previous page's ``next_cursor``) pages by ``(published_at, id)``
+        and ignores ``offset``. ``include_total`` defaults to counting on the first page only.
+        """
+
+        rows, total, next_cursor = self._page(
+            [Paper],
+            category=category,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
         )
-        stmt = (
-            select(Paper)
-            .where(*filters)
-            .order_by(Paper.published_at.desc())
-            .offset(offset)
-            .limit(limit)
+        items = [PaperOut.model_validate(paper) for paper in rows]
+        return PaginatedPapers(items=items, total=total, next_cursor=next_cursor)
+
+    def list_papers_document(
+        self,
+        *,
+        category: str | None,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fast path of ``list_papers``: Core rows decoded once into JSON-ready dicts.
+
+        Without ``fields`` every public field is returned, in ``PaperOut`` order, so the
+        encoded document matches the ``PaginatedPapers`` response byte for byte.
+        """
+
+        fields = tuple(fields or _PROJECTABLE_FIELDS)
+        unknown = [field for field in fields if field not in _PROJECTABLE_FIELDS]
+        if unknown:
+            raise InvalidProjection(", ".join(unknown))
+        # id and published_at are always loaded for the keyset cursor
+        targets: list[Any] = [Paper.id.label("cursor_id"), Paper.published_at.label("cursor_published_at")]
+        targets.extend(_PROJECTABLE_FIELDS[field][0].label(field) for field in fields)
+        rows, total, next_cursor = self._page(
+            targets,
+            category=category,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
         )
-        items = [PaperOut.model_validate(paper) for paper in self.session.scalars(stmt)]
-        return PaginatedPapers(items=items, total=total)
+        items = [_project_row(row, fields) for row in rows]
+        return {"items": items, "total": total, "next_cursor": next_cursor}
 
-    def distinct_categories(self) -> List[str]:
-        rows = self.session.execute(select(Paper.categories)).scalars().all()
-        categories: set[str] = set()
+    def _page(
+        self,
+        targets: Sequence[Any],
+        *,
+        category: str | None,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        include_total: bool | None,
+    ) -> tuple[list[Any], int | None, str | None]:
+        entities = len(targets) == 1 and targets[0] is Paper
+        if category:
+            # Filter, order, keyset and count are all served by ix_paper_categories_category_published.
+            published_at, paper_id = PaperCategory.published_at, PaperCategory.paper_id
+            stmt = (
+                select(*targets)
+                .join(PaperCategory, PaperCategory.paper_id == Paper.id)
+                .where(PaperCategory.category == category)
+            )
+            count_stmt = select(func.count()).select_from(PaperCategory).where(PaperCategory.category == category)
+        else:
+            published_at, paper_id = Paper.published_at, Paper.id
+            stmt = select(*targets)
+            count_stmt = select(func.count()).select_from(Paper)
+
+        if cursor:
+            stmt = stmt.where(tuple_(published_at, paper_id) < tuple_(*decode_cursor(cursor)))
+        elif offset:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(published_at.desc(), paper_id.desc()).limit(limit + 1)
+        rows = list(self.session.scalars(stmt)) if entities else list(self.session.execute(stmt))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if entities:
+                next_cursor = encode_cursor(last.published_at, last.id)
+            else:
+                next_cursor = encode_cursor(last.cursor_published_at, last.cursor_id)
+        if include_total is None:
+            include_total = cursor is None
+        total = (self.session.scalar(count_stmt) or 0) if include_total else None
+        return rows, total, next_cursor
+
+    def get_paper(self, arxiv_id: str) -> PaperOut | None:
+        # any version (or none) resolves to the paper's current row
+        paper = self.session.scalar(select(Paper).where(Paper.base_id == split_arxiv_id(arxiv_id)[0]))
+        return PaperOut.model_validate(paper) if paper is not None else None
+
+    def search(self, query: str, *, category: str | None = None, limit: int = 20) -> SearchResults:
+        """Full-text search ranked by BM25 (title > authors > abstract > summary)."""
+
+        terms = _search_terms(query)
+        if not terms:
+            return SearchResults(query=query, items=[])
+        if search_index_available():
+            hits = self._search_fts(terms, category=category, limit=limit)
+        else:
+            hits = self._search_like(terms, category=category, limit=limit)
+        return SearchResults(query=query, items=hits)
+
+    def _search_fts(self, terms: Sequence[str], *, category: str | None, limit: int) -> list[SearchHit]:
+        category_clause = (
+            "AND EXISTS (SELECT 1 FROM paper_categories "
+            "WHERE paper_categories.paper_id = papers.id AND paper_categories.category = :category)"
+            if category
+            else ""
+        )
+        rows = self.session.execute(
+            text(
+                f"""
+                SELECT papers_fts.rowid AS id,
+                       bm25(papers_fts, 10.0, 4.0, 2.0, 1.0) AS score,
+                       snippet(papers_fts, -1, :open, :close, '…', 24) AS snippet
+                FROM papers_fts JOIN papers ON papers.id = papers_fts.rowid
+                WHERE papers_fts MATCH :match {category_clause}
+                ORDER BY score
+                LIMIT :limit
+                """
+            ),
+            {
+                "match": _fts_match_expression(terms),
+                "open": _MATCH_OPEN,
+                "close": _MATCH_CLOSE,
+                "category": category,
+                "limit": limit,
+            },
+        ).all()
+        if not rows:
+            return []
+        papers = {
+            paper.id: paper
+            for paper in self.session.scalars(select(Paper).where(Paper.id.in_([row.id for row in rows])))
+        }
+        hits: list[SearchHit] = []
         for row in rows:
-            if not row:
+            paper = papers.get(row.id)
+            if paper is None:
                 continue
-            for item in row.split(","):
-                if item.strip():
-                    categories.add(item.strip())
-        return sorted(categories)
+            hit = SearchHit.model_validate(paper)
+            hit.snippet = _render_snippet(row.snippet)
+            # bm25() is lower-is-better; flip it so clients can sort descending
+            hit.score = round(-float(row.score), 4)
+            hits.append(hit)
+        return hits
+
+    def _search_like(self, terms: Sequence[str], *, category: str | None, limit: int) -> list[SearchHit]:
+        columns = (Paper.title, Paper.authors, Paper.abstract, Paper.summary)
+        filters = [or_(*(column.ilike(f"%{term}%") for column in columns)) for term in terms]
+        if category:
+            filters.append(
+                exists().where(PaperCategory.paper_id == Paper.id, PaperCategory.category == category)
+            )
+        stmt = select(Paper).where(and_(*filters)).order_by(Paper.published_at.desc()).limit(limit)
+        return [SearchHit.model_validate(paper) for paper in self.session.scalars(stmt)]
 
-    def _get_by_arxiv_id(self, arxiv_id: str) -> Paper | None:
-        stmt = select(Paper).where(Paper.arxiv_id == arxiv_id)
-        return self.session.scalar(stmt)
+    def distinct_categories(self) -> List[str]:
+        return [entry.category for entry in self.category_stats()]
+
+    def category_stats(self) -> List[CategoryOut]:
+        """Per-category counts from the maintained catalog; O(#categories), cached per corpus generation."""
+
+        return category_catalog.entries(self.session)
 
     def _update_existing(self, entity: Paper, scraped: ScrapedPaper) -> None:
+        entity.arxiv_id = scraped.arxiv_id  # type: ignore[assignment]
+        entity.version = split_arxiv_id(scraped.arxiv_id)[1]  # type: ignore[assignment]
+        entity.abstract_hash = abstract_fingerprint(scraped.abstract)  # type: ignore[assignment]
         entity.title = scraped.title  # type: ignore[assignment]
         entity.authors = ";".join(scraped.authors)  # type: ignore[assignment]
         if hasattr(scraped, "affiliations"):
@@ -139,24 +565,174 @@ class PaperService:
         entity.updated_at = scraped.updated_at  # type: ignore[assignment]
         self.session.add(entity)
 
-    async def _summarize_if_needed(self, entity: Paper, paper: ScrapedPaper) -> bool:
+    def _store_metadata(self, batch: Sequence[ScrapedPaper]) -> _StoredBatch:
+        """Upsert one batch of scraped papers with a single lookup, write and commit.
+
+        Papers are matched on their arXiv id without the version suffix, so a new
+        revision updates the existing row. Its summary is kept when the abstract is
+        unchanged; otherwise the paper is queued for a low-priority re-summary.
+        """
+
+        base_ids = {paper.arxiv_id: split_arxiv_id(paper.arxiv_id)[0] for paper in batch}
+        existing = {
+            entity.base_id: entity
+            for entity in self.session.scalars(select(Paper).where(Paper.base_id.in_(set(base_ids.values()))))
+        }
+        newest = _newest_revisions(batch)
+        created = {paper.arxiv_id for paper in newest if base_ids[paper.arxiv_id] not in existing}
+        # captured before the upsert refreshes the entities
+        previous_hashes = {base_id: entity.abstract_hash for base_id, entity in existing.items()}
+        changed = [
+            paper
+            for paper in newest
+            if paper.arxiv_id in created
+            or (
+                # a lagging feed may still list an older version; it never overwrites a newer one
+                split_arxiv_id(paper.arxiv_id)[1] >= existing[base_ids[paper.arxiv_id]].version
+                and self._has_changes(existing[base_ids[paper.arxiv_id]], paper)
+            )
+        ]
+        if changed:
+            self._upsert(changed, existing)
+
+        by_base_id = {
+            entity.base_id: entity
+            for entity in self.session.scalars(
+                select(Paper)
+                .where(Paper.base_id.in_(set(base_ids.values())))
+                .execution_options(populate_existing=True)
+            )
+        }
+        entities = {paper.arxiv_id: by_base_id[base_ids[paper.arxiv_id]] for paper in batch}
+        if changed:
+            self._sync_categories([entities[paper.arxiv_id] for paper in changed])
+        needs_summary: set[str] = set()
+        revised: set[int] = set()
+        marked = False
+        for paper in batch:
+            entity = entities[paper.arxiv_id]
+            if not self._needs_summary(entity, paper):
+                previous_hash = previous_hashes.get(base_ids[paper.arxiv_id])
+                if (
+                    self.summarizer.uses_llm
+                    and previous_hash not in (None, entity.abstract_hash)
+                    and not entity.summary_is_current()
+                ):
+                    revised.add(entity.id)  # type: ignore[arg-type]
+                continue
+            if self.summarizer.uses_llm:
+                needs_summary.add(paper.arxiv_id)
+            elif entity.summary_model != "not-run":
+                self._mark_summary_not_run(entity)
+                marked = True
+        if changed or marked:
+            # readers key their caches on the generation, so bump it in the same commit
+            bump_generation(self.session)
+        queue = SummaryJobQueue(self.session, self.settings)
+        enqueued = queue.enqueue(
+            entities[arxiv_id].id for arxiv_id in needs_summary  # type: ignore[misc]
+        )
+        # the current summary stays visible until the revision's summary replaces it
+        requeued = queue.enqueue(revised, priority=self.settings.summary_revision_priority)
+        events = [_event_data(entities[paper.arxiv_id]) for paper in newest if paper.arxiv_id in created]
+        self.session.commit()
+        for event in events:
+            event_broker.publish(PAPER_CREATED, event)
+        return _StoredBatch(
+            entities=entities,
+            created=created,
+            needs_summary=needs_summary,
+            enqueued=enqueued,
+            revised=requeued,
+        )
+
+    def _upsert(self, papers: Sequence[ScrapedPaper], existing: dict[str, Paper]) -> None:
+        insert = _dialect_insert(self.session.get_bind().dialect.name)
+        if insert is None:
+            for paper in papers:
+                entity = existing.get(split_arxiv_id(paper.arxiv_id)[0])
+                if entity is None:
+                    self.session.add(self._create_entity(paper))
+                else:
+                    self._update_existing(entity, paper)
+            self.session.flush()
+            return
+
+        stmt = insert(Paper).values([self._scraped_values(paper) for paper in papers])
+        if hasattr(stmt, "on_conflict_do_update"):
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Paper.base_id],
+                set_={field: stmt.excluded[field] for field in _UPDATABLE_FIELDS},
+            )
+        else:  # MySQL / MariaDB
+            stmt = stmt.on_duplicate_key_update(
+                {field: stmt.inserted[field] for field in _UPDATABLE_FIELDS}
+            )
+        self.session.execute(stmt)
+
+    def _sync_categories(self, entities: Sequence[Paper]) -> None:
+        """Rewrite the paper_categories rows of ``entities``; covers both the native and ORM upsert paths."""
+
+        paper_ids = [entity.id for entity in entities]
+        removed = self.session.scalars(
+            select(PaperCategory.category).where(PaperCategory.paper_id.in_(paper_ids))
+        ).all()
+        self.session.execute(delete(PaperCategory).where(PaperCategory.paper_id.in_(paper_ids)))
+        rows = [
+            {"paper_id": entity.id, "category": category, "published_at": entity.published_at}
+            for entity in entities
+            for category in split_categories(entity.categories)  # type: ignore[arg-type]
+        ]
+        if rows:
+            self.session.execute(insert(PaperCategory), rows)
+        apply_category_changes(self.session, removed, [(row["category"], row["published_at"]) for row in rows])
+
+    @staticmethod
+    def _scraped_values(paper: ScrapedPaper) -> dict[str, object]:
+        affiliations = getattr(paper, "affiliations", None)
+        base_id, version = split_arxiv_id(paper.arxiv_id)
+        return {
+            "arxiv_id": paper.arxiv_id,
+            "base_id": base_id,
+            "version": version,
+            "abstract_hash": abstract_fingerprint(paper.abstract),
+            "title": paper.title,
+            "authors": ";".join(paper.authors),
+            "author_affiliations": ";".join(affiliation or "" for affiliation in affiliations)
+            if affiliations
+            else None,
+            "abstract": paper.abstract,
+            "categories": ",".join(paper.categories),
+            "link": paper.link,
+            "pdf_url": paper.pdf_url,
+            "published_at": paper.published_at,
+            "updated_at": paper.updated_at,
+        }
+
+    def _has_changes(self, entity: Paper, paper: ScrapedPaper) -> bool:
+        values = self._scraped_values(paper)
+        return any(
+            _comparable(getattr(entity, field)) != _comparable(values[field]) for field in _UPDATABLE_FIELDS
+        )
+
+    @staticmethod
+    def _needs_summary(entity: Paper, paper: ScrapedPaper) -> bool:
         existing_summary = (entity.summary or "").strip()
-        if existing_summary:
-            return False
-        if not paper.abstract:
-            return False
-        if not self.summarizer.uses_llm:
-            self._mark_summary_not_run(entity)
-            return False
+        return not existing_summary and bool(paper.abstract)
+
+    async def _summarize_paper(self, paper: SummaryRequest, slots: _PipelineSlots) -> str:
+        full_text = await self._load_full_text(paper, slots)
         try:
-            full_text = await self._load_full_text(paper)
-            summary_text = await self.summarizer.summarize(
-                paper.title,
-                paper.abstract,
-                full_text=full_text,
-            )
+            async with slots.summarize:
+                return await self.summarizer.summarize(
+                    paper.title,
+                    paper.abstract,
+                    full_text=full_text,
+                )
         except Exception:
-            summary_text = ""
+            return ""
+
+    def _apply_summary(self, entity: Paper, summary_text: str) -> bool:
         if summary_text:
             entity.mark_summarized(
                 summary_text,
@@ -164,12 +740,19 @@ class PaperService:
                 language=self.settings.summary_language,
             )
             return True
+        if (entity.summary or "").strip():
+            # a failed re-summary of a revision keeps the previous summary visible
+            return False
         self._mark_summary_failed(entity)
         return False
 
     def _create_entity(self, paper: ScrapedPaper) -> Paper:
+        base_id, version = split_arxiv_id(paper.arxiv_id)
         return Paper(
             arxiv_id=paper.arxiv_id,
+            base_id=base_id,
+            version=version,
+            abstract_hash=abstract_fingerprint(paper.abstract),
             title=paper.title,
             authors=";".join(paper.authors),
             author_affiliations=";".join(
@@ -199,11 +782,17 @@ class PaperService:
         entity.summary_language = None  # type: ignore[assignment]
         entity.last_summarized_at = None  # type: ignore[assignment]
 
-    async def _load_full_text(self, paper: ScrapedPaper) -> str:
+    async def _load_full_text(self, paper: SummaryRequest, slots: _PipelineSlots) -> str:
         if not self.summarizer.uses_llm:
             return ""
         try:
-            return await fetch_full_text(paper.arxiv_id, paper.pdf_url, self.settings)
+            async with slots.fetch:
+                document = await download_pdf(paper.arxiv_id, paper.pdf_url, self.settings)
+            if document is None:
+                return ""
+            with document:
+                async with slots.extract:
+                    return await extract_pdf_text(document, self.settings)
         except Exception:
             return ""
 
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy.orm import Session
+
+from .catalog import current_generation
+from .config import Settings, settings
+from .database import run_in_session
+from .serialization import dumps
+from .service import PaperService
+from .timeutil import as_aware_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class SnapshotWriter:
+    """Renders the static digest: per-category JSON, an HTML page and Atom feeds.
+
+    Layout under ``snapshot_dir``::
+
+        index.html              HTML digest of every category
+        atom.xml                newest papers across categories
+        categories.json         catalog with counts
+        papers/<category>.json  newest papers, same shape as /api/papers
+        feeds/<category>.xml    per-category Atom feed
+        manifest.json           generation the files were rendered from (written last)
+
+    Every file is replaced atomically, so a web server or CDN never sees a partial write.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, session: Session, configuration: Settings | None = None) -> None:
+        self.session = session
+        self.settings = configuration or settings
+        self.directory = Path(self.settings.snapshot_dir)
+        self._templates = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), autoescape=True)
+
+    def write(self, *, force: bool = False) -> bool:
+        """Render the snapshot unless it is already at the current corpus generation."""
+
+        generation = current_generation(self.session)
+        if not force and self._manifest().get("generation") == generation:
+            return False
+
+        service = PaperService(session=self.session, configuration=self.settings)
+        limit = max(1, self.settings.snapshot_papers_per_category)
+        catalog = service.category_stats()
+        pages = {
+            entry.category: service.list_papers_document(category=entry.category, limit=limit, include_total=True)
+            for entry in catalog
+        }
+        latest = service.list_papers_document(category=None, limit=limit, include_total=False)
+        generated_at = utcnow()
+
+        written: dict[str, set[str]] = {"papers": set(), "feeds": set()}
+        for category, page in pages.items():
+            name = _filename(category)
+            self._write(f"papers/{name}.json", dumps(page))
+            self._write(f"feeds/{name}.xml", self._render_feed(category, page["items"], generated_at))
+            written["papers"].add(f"{name}.json")
+            written["feeds"].add(f"{name}.xml")
+        self._write("categories.json", dumps([entry.model_dump(mode="json") for entry in catalog]))
+        self._write("atom.xml", self._render_feed(None, latest["items"], generated_at))
+        self._write(
+            "index.html",
+            self._templates.get_template("digest.html")
+            .render(pages=pages, catalog=catalog, generated_at=generated_at, filename=_filename)
+            .encode(),
+        )
+        for subdirectory, keep in written.items():
+            self._remove_stale(subdirectory, keep)
+        manifest = {
+            "generation": generation,
+            "generated_at": generated_at.isoformat(),
+            "categories": [entry.category for entry in catalog],
+        }
+        self._write(self.MANIFEST, json.dumps(manifest).encode())
+        return True
+
+    def _render_feed(self, category: str | None, items: list[dict[str, Any]], generated_at: datetime) -> bytes:
+        base_url = (self.settings.snapshot_base_url or "").rstrip("/")
+        self_path = f"feeds/{_filename(category)}.xml" if category else "atom.xml"
+        updated = max((item["updated_at"] for item in items), default=generated_at)
+        return (
+            self._templates.get_template("atom.xml")
+            .render(
+                category=category,
+                items=items,
+                updated=_rfc3339(updated),
+                self_url=f"{base_url}/{self_path}" if base_url else None,
+                rfc3339=_rfc3339,
+            )
+            .encode()
+        )
+
+    def _manifest(self) -> dict[str, Any]:
+        try:
+            return json.loads((self.directory / self.MANIFEST).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, relative: str, payload: bytes) -> None:
+        target = self.directory / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(dir=target.parent, prefix=".tmp-", delete=False)
+        try:
+            with handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(handle.name, 0o644)  # mkstemp creates 0600; the web server must read it
+            os.replace(handle.name, target)
+        except BaseException:
+            Path(handle.name).unlink(missing_ok=True)
+            raise
+
+    def _remove_stale(self, subdirectory: str, keep: set[str]) -> None:
+        for path in (self.directory / subdirectory).glob("*"):
+            if path.is_file() and path.name not in keep:
+                path.unlink(missing_ok=True)
+
+
+async def publish_snapshot(configuration: Settings | None = None, *, force: bool = False) -> bool:
+    """Refresh the static snapshot off the event loop; failures are logged, never raised."""
+
+    configuration = configuration or settings
+    if not configuration.snapshot_enabled:
+        return False
+    try:
+        return await run_in_session(lambda session: SnapshotWriter(session, configuration).write(force=force))
+    except Exception:
+        logger.exception("Writing the static snapshot failed")
+        return False
+
+
+def _filename(category: str | None) -> str:
+    return _UNSAFE_FILENAME.sub("_", category or "all")
+
+
+def _rfc3339(value: datetime) -> str:
+    return as_aware_utc(value).strftime("%Y-%m-%dT%H:%M:%SZ")
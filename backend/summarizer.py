@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import textwrap
 from typing import Any, List, Optional
 
@@ -7,6 +8,7 @@ from openai import AsyncOpenAI, OpenAIError
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from .config import Settings, settings
+from .llm_cache import LLMResponseCache
 
 
 class Summarizer:
@@ -14,9 +16,15 @@ class Summarizer:
         self,
         *,
         configuration: Settings,
+        cache: LLMResponseCache | None = None,
     ) -> None:
         self._settings = configuration
         self._client: AsyncOpenAI | None = None
+        self._cache = cache
+
+    @property
+    def cache(self) -> LLMResponseCache | None:
+        return self._cache
 
     @property
     def uses_llm(self) -> bool:
@@ -60,10 +68,11 @@ class Summarizer:
             ).strip()
             return await self._call_llm(prompt)
 
-        summaries: List[str] = []
         max_chunks = max(1, self._settings.full_text_max_chunks)
         limited_segments = segments[:max_chunks]
-        for index, segment in enumerate(limited_segments, start=1):
+        slots = asyncio.Semaphore(max(1, self._settings.summary_chunk_concurrency))
+
+        async def summarize_segment(index: int, segment: str) -> str:
             prompt = textwrap.dedent(
                 f"""
                 你是一位研究助理，正在阅读一篇arXiv论文的部分内容。
@@ -76,9 +85,17 @@ class Summarizer:
                 {segment}
                 """
             ).strip()
-            summary = await self._call_llm(prompt)
-            if summary:
-                summaries.append(summary.strip())
+            async with slots:
+                return await self._call_llm(prompt)
+
+        # gather keeps segment order; failed segments are dropped so the rest still feed the reduce step
+        results = await asyncio.gather(
+            *(summarize_segment(index, segment) for index, segment in enumerate(limited_segments, start=1)),
+            return_exceptions=True,
+        )
+        summaries: List[str] = [
+            result.strip() for result in results if isinstance(result, str) and result.strip()
+        ]
 
         if not summaries:
             prompt = textwrap.dedent(
@@ -149,6 +166,18 @@ class Summarizer:
         return chunks
 
     async def _call_llm(self, prompt: str) -> str:
+        if self._cache is None:
+            return await self._request_completion(prompt)
+        key = LLMResponseCache.build_key(self._settings.llm_model, self._settings.llm_base_url, prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        summary_text = await self._request_completion(prompt)
+        if summary_text:
+            self._cache.put(key, self._settings.llm_model, summary_text)
+        return summary_text
+
+    async def _request_completion(self, prompt: str) -> str:
         client = self._get_client()
 
         async for attempt in AsyncRetrying(
@@ -179,4 +208,6 @@ class Summarizer:
 
 
 def get_summarizer(settings_override: Optional[Settings] = None) -> Summarizer:
-    return Summarizer(configuration=settings_override or settings)
+    configuration = settings_override or settings
+    cache = LLMResponseCache(configuration=configuration) if configuration.llm_cache_enabled else None
+    return Summarizer(configuration=configuration, cache=cache)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+# SQLite hands datetimes back without tzinfo; every value this app stores is UTC.
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Naive UTC, for comparing stored values with aware ones."""
+
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def as_aware_utc(value: datetime) -> datetime:
+    """Aware UTC; a naive value is taken to be UTC already."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
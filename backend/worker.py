@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import Settings, settings
+from .coordination import default_worker_id
+from .database import create_session
+from .jobs import SummaryJobQueue
+from .models import Paper, SummaryJob
+from .service import PaperService
+from .snapshots import publish_snapshot
+from .summarizer import Summarizer, get_summarizer
+
+logger = logging.getLogger(__name__)
+
+ResultCallback = Callable[[Paper, bool], None]
+
+
+class SummaryWorker:
+    """Claims summary jobs, runs them through the refresh pipeline and records the outcome."""
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        configuration: Settings | None = None,
+        summarizer: Summarizer | None = None,
+        service: PaperService | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self.session = session
+        self.service = service or PaperService(session=session, configuration=configuration, summarizer=summarizer)
+        self.settings = self.service.settings
+        self.queue = SummaryJobQueue(session, self.settings)
+        self.worker_id = worker_id or default_worker_id()
+
+    async def run_once(
+        self,
+        *,
+        paper_ids: Iterable[int] | None = None,
+        on_result: ResultCallback | None = None,
+    ) -> int:
+        """Process one batch of ready jobs; returns the number of jobs claimed."""
+
+        jobs = self.queue.claim(
+            self.worker_id,
+            limit=self.settings.summary_worker_batch_size,
+            paper_ids=paper_ids,
+        )
+        if not jobs:
+            return 0
+        by_paper = {job.paper_id: job for job in jobs}
+        papers = {
+            paper.id: paper for paper in self.session.scalars(select(Paper).where(Paper.id.in_(list(by_paper))))
+        }
+        todo: list[Paper] = []
+        for paper_id, job in by_paper.items():
+            paper = papers.get(paper_id)
+            # a revised paper keeps its old summary until this job replaces it
+            if paper is None or paper.summary_is_current() or not paper.abstract:
+                self.queue.complete(job, outcome="skipped")
+                continue
+            todo.append(paper)
+        self.session.commit()
+
+        def record(paper: Paper, summarized: bool) -> None:
+            job: SummaryJob = by_paper[paper.id]  # type: ignore[index]
+            if summarized:
+                self.queue.complete(job)
+            else:
+                self.queue.fail(job, "LLM returned no summary")
+            if on_result is not None:
+                on_result(paper, summarized)
+
+        heartbeat = asyncio.create_task(self._heartbeat([job.id for job in jobs]))  # type: ignore[misc]
+        try:
+            await self.service.summarize_papers(todo, on_result=record)
+        except BaseException:
+            # cancelled or crashed mid-batch: give unfinished jobs back instead of waiting out the lease
+            self.session.rollback()
+            self.queue.release(self.worker_id)
+            raise
+        finally:
+            heartbeat.cancel()
+        return len(jobs)
+
+    async def _heartbeat(self, job_ids: list[int]) -> None:
+        interval = max(1.0, self.settings.summary_job_lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            # session work is synchronous, so this never interleaves with a half-written result
+            extended = self.queue.heartbeat(self.worker_id, job_ids)
+            if not extended:
+                return
+
+    async def drain(
+        self,
+        *,
+        paper_ids: Iterable[int] | None = None,
+        on_result: ResultCallback | None = None,
+    ) -> int:
+        """Work until no job is ready; jobs waiting on a retry backoff are left for later.
+
+        Returns the number of jobs claimed.
+        """
+
+        scope = list(paper_ids) if paper_ids is not None else None
+        claimed = 0
+        while processed := await self.run_once(paper_ids=scope, on_result=on_result):
+            claimed += processed
+        return claimed
+
+
+async def run_summary_worker(
+    stop: asyncio.Event,
+    *,
+    configuration: Settings | None = None,
+    wake: asyncio.Event | None = None,
+) -> None:
+    """Long-running loop used by the app: backfill missing summaries, then poll the queue."""
+
+    configuration = configuration or settings
+    summarizer = get_summarizer(configuration)
+    if not summarizer.uses_llm:
+        logger.info("Summary worker not started: LLM API key is not configured")
+        return
+    worker_id = default_worker_id()
+    logger.info("Summary worker %s started", worker_id)
+    backfilled = False
+    while not stop.is_set():
+        session = create_session()
+        try:
+            worker = SummaryWorker(session, configuration=configuration, summarizer=summarizer, worker_id=worker_id)
+            if not backfilled:
+                backfilled = True
+                try:
+                    queued = worker.queue.enqueue_missing()
+                    session.commit()
+                except IntegrityError:
+                    # another node enqueued the same papers first
+                    session.rollback()
+                    queued = 0
+                if queued:
+                    logger.info("Queued %s papers without a summary", queued)
+            if await worker.drain():
+                await publish_snapshot(configuration)
+        except Exception:
+            logger.exception("Summary worker iteration failed")
+        finally:
+            session.close()
+        await _wait_for_work(stop, wake, configuration.summary_worker_poll_seconds)
+    logger.info("Summary worker %s stopped", worker_id)
+
+
+async def _wait_for_work(stop: asyncio.Event, wake: asyncio.Event | None, timeout: float) -> None:
+    waiters = [asyncio.create_task(stop.wait())]
+    if wake is not None:
+        waiters.append(asyncio.create_task(wake.wait()))
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+    if wake is not None:
+        wake.clear()
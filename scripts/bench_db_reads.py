@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Measure read-endpoint latency under concurrent load, inline vs. on the DB executor.
+
+Seeds a throwaway SQLite file, then drives the ASGI app in-process with ``/api/papers``
+requests arriving at a fixed rate while a few clients issue broad ``/api/search`` queries
+(the slow query). Latency is measured from each request's scheduled send time, so time
+spent waiting for a blocked event loop counts. Prints p50/p95/p99 for the listing and
+the worst event-loop lag.
+
+    python scripts/bench_db_reads.py --papers 50000 --workers 0 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+from sqlalchemy import text
+
+from backend import database
+from backend.config import settings
+from backend.models import abstract_fingerprint, split_arxiv_id
+
+CATEGORIES = ["cs.DC", "cs.OS", "cs.AR"]
+WORDS = "gpu cluster kernel scheduling memory cache network graph storage compiler runtime fault".split()
+
+
+def seed(database_url: str, papers: int) -> None:
+    database.configure_engine(database_url)
+    database.init_db()
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "arxiv_id": f"bench.{index:06d}v1",
+            "title": " ".join(rng.choices(WORDS, k=6)),
+            "authors": "Alice;Bob",
+            "abstract": " ".join(rng.choices(WORDS, k=120)),
+            "categories": ",".join(rng.sample(CATEGORIES, k=rng.randint(1, 2))),
+            "link": f"https://arxiv.org/abs/bench.{index:06d}",
+            "published_at": start + timedelta(minutes=index),
+            "updated_at": start + timedelta(minutes=index),
+        }
+        for index in range(papers)
+    ]
+    for row in rows:
+        # raw SQL skips the model's Python-side defaults for these columns
+        row["base_id"], row["version"] = split_arxiv_id(row["arxiv_id"])
+        row["abstract_hash"] = abstract_fingerprint(row["abstract"])
+    with database.get_engine().begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO papers (arxiv_id, base_id, version, abstract_hash, title, authors, abstract, "
+                "categories, link, published_at, updated_at, created_at) VALUES (:arxiv_id, :base_id, "
+                ":version, :abstract_hash, :title, :authors, :abstract, :categories, :link, :published_at, "
+                ":updated_at, CURRENT_TIMESTAMP)"
+            ),
+            rows,
+        )
+    database.init_db()  # backfills paper_categories and the category catalog
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def run_load(requests: int, rate: float, searchers: int) -> tuple[list[float], float]:
+    from backend.app import app
+
+    latencies: list[float] = []
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def watch_loop() -> None:
+        nonlocal max_lag
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - before - 0.01)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def list_page(index: int, scheduled: float) -> None:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            response = await client.get(f"/api/papers?category={CATEGORIES[index % 3]}&limit=20")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - scheduled)
+
+        async def searcher() -> None:
+            while not done.is_set():
+                await client.get("/api/search", params={"q": random.choice(WORDS)})
+                await asyncio.sleep(0)  # the in-process transport may never suspend on its own
+
+        watcher = asyncio.create_task(watch_loop())
+        background = [asyncio.create_task(searcher()) for _ in range(searchers)]
+        started = time.perf_counter() + 0.05
+        await asyncio.gather(*(list_page(index, started + index / rate) for index in range(requests)))
+        done.set()
+        await asyncio.gather(watcher, *background)
+    return latencies, max_lag
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=100, help="listing requests per second")
+    parser.add_argument("--searchers", type=int, default=2, help="clients issuing slow search queries")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 8], help="db_executor_workers values to compare")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{Path(directory) / 'bench.sqlite3'}"
+        print(f"Seeding {args.papers} papers...", flush=True)
+        seed(database_url, args.papers)
+        print(f"{'workers':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'loop lag ms':>12}")
+        for workers in args.workers:
+            settings.db_executor_workers = workers
+            database.shutdown_db_executor()
+            database.configure_engine(database_url)
+            latencies, lag = asyncio.run(run_load(args.requests, args.rate, args.searchers))
+            print(
+                f"{workers:>8} {statistics.median(latencies) * 1000:>8.1f} "
+                f"{percentile(latencies, 0.95) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{max(latencies) * 1000:>8.1f} {lag * 1000:>12.1f}",
+                flush=True,
+            )
+        database.shutdown_db_executor()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Compare /api/papers serialization paths at limit=100.
+
+``pydantic``: ORM entities -> PaperOut.model_validate -> PaginatedPapers JSON (the old path).
+``fast``: Core rows decoded once -> serialization.dumps (orjson).
+
+    python scripts/bench_serialization.py --papers 2000 --limit 100 --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text
+
+from backend import database, serialization
+from backend.models import abstract_fingerprint, split_arxiv_id
+from backend.service import PaperService
+
+
+def seed(papers: int) -> None:
+    database.configure_engine("sqlite+pysqlite:///:memory:")
+    database.init_db()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "arxiv_id": f"bench.{index:06d}v1",
+            "title": f"Benchmark paper {index} on distributed scheduling",
+            "authors": ";".join(f"Author {n}" for n in range(6)),
+            "affiliations": ";".join(f"University {n}" for n in range(6)),
+            "abstract": "Lorem ipsum dolor sit amet. " * 40,
+            "summary": "要点总结。" * 120,
+            "categories": "cs.DC,cs.OS",
+            "link": f"https://arxiv.org/abs/bench.{index:06d}",
+            "published_at": start + timedelta(minutes=index),
+        }
+        for index in range(papers)
+    ]
+    for row in rows:
+        # raw SQL skips the model's Python-side defaults for these columns
+        row["base_id"], row["version"] = split_arxiv_id(row["arxiv_id"])
+        row["abstract_hash"] = abstract_fingerprint(row["abstract"])
+    with database.get_engine().begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO papers (arxiv_id, base_id, version, abstract_hash, summary_abstract_hash, title, "
+                "authors, author_affiliations, abstract, summary, summary_model, categories, link, published_at, "
+                "updated_at, last_summarized_at, created_at) "
+                "VALUES (:arxiv_id, :base_id, :version, :abstract_hash, :abstract_hash, :title, :authors, "
+                ":affiliations, :abstract, :summary, 'qwen', :categories, :link, :published_at, :published_at, "
+                ":published_at, CURRENT_TIMESTAMP)"
+            ),
+            rows,
+        )
+    database.init_db()
+
+
+def measure(label: str, render, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        render()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples) * 1000
+    print(f"{label:>10}: median {median:7.2f} ms   p95 {sorted(samples)[int(rounds * 0.95) - 1] * 1000:7.2f} ms")
+    return median
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    seed(args.papers)
+    session = database.create_session()
+    try:
+        service = PaperService(session=session)
+
+        def pydantic_path() -> bytes:
+            page = service.list_papers(category="cs.DC", limit=args.limit)
+            return page.model_dump_json(by_alias=True).encode()
+
+        def fast_path() -> bytes:
+            document = service.list_papers_document(category="cs.DC", limit=args.limit)
+            return serialization.dumps(document)
+
+        assert pydantic_path() == fast_path(), "fast path output differs from the PaperOut response"
+        print(f"payload {len(fast_path())} bytes")
+        before = measure("pydantic", pydantic_path, args.rounds)
+        after = measure("fast", fast_path, args.rounds)
+        print(f"speedup: {before / after:.1f}x")
+    finally:
+        session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,42 @@
 from __future__ import annotations
 
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
+
+import pytest
 
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from backend import database  # noqa: E402
+from backend.scraper import ScrapedPaper  # noqa: E402
+
+
+@pytest.fixture
+def memory_db() -> None:
+    database.configure_engine("sqlite+pysqlite:///:memory:")
+    database.init_db()
+
+
+@pytest.fixture
+def make_scraped_paper() -> Callable[..., ScrapedPaper]:
+    def make(arxiv_id: str, *, day: int = 5, **fields) -> ScrapedPaper:
+        timestamp = datetime(2024, 1, day, tzinfo=timezone.utc)
+        authors = fields.pop("authors", ["Alice"])
+        values = {
+            "title": "Paper",
+            "affiliations": [None] * len(authors),
+            "abstract": "Abstract",
+            "categories": ["cs.DC"],
+            "link": f"https://arxiv.org/abs/{arxiv_id}",
+            "pdf_url": None,
+            "published_at": timestamp,
+            "updated_at": timestamp,
+        }
+        values.update(fields)
+        return ScrapedPaper(arxiv_id=arxiv_id, authors=authors, **values)
+
+    return make
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from backend import app as app_module
+from backend import database
+from backend.config import Settings
+from backend.response_cache import ResponseCache
+from backend.serialization import dumps
+from backend.service import PaperService
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(memory_db, monkeypatch) -> None:
+    monkeypatch.setattr(app_module, "_response_cache", ResponseCache(max_entries=16))
+
+
+@pytest.fixture
+def ingest(make_scraped_paper):
+    def ingest(arxiv_id: str, category: str) -> None:
+        session = database.create_session()
+        try:
+            service = PaperService(session=session, configuration=Settings(llm_api_key=None, scheduler_enabled=False))
+            service._store_metadata([make_scraped_paper(arxiv_id, title="Cached", categories=[category])])
+        finally:
+            session.close()
+
+    return ingest
+
+
+@pytest.mark.asyncio
+async def test_read_responses_are_cached_per_generation_with_etags(monkeypatch, ingest) -> None:
+    ingest("2401.50001v1", "cs.DC")
+    calls = 0
+    original = PaperService.list_papers_document
+
+    def counting_list_papers(self, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(PaperService, "list_papers_document", counting_list_papers)
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/papers", params={"category": "cs.DC", "limit": 5})
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and "max-age" in first.headers["cache-control"]
+        assert first.json()["items"][0]["arxiv_id"] == "2401.50001v1"
+
+        # same query in a different parameter order is served from the cache
+        again = await client.get("/api/papers", params={"limit": 5, "category": "cs.DC"})
+        assert again.headers["etag"] == etag and again.content == first.content
+        assert calls == 1
+
+        not_modified = await client.get(
+            "/api/papers", params={"category": "cs.DC", "limit": 5}, headers={"If-None-Match": etag}
+        )
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        # another category's ingest bumps the generation, but the unchanged page keeps its validator
+        ingest("2401.50003v1", "cs.OS")
+        unaffected = await client.get(
+            "/api/papers", params={"category": "cs.DC", "limit": 5}, headers={"If-None-Match": etag}
+        )
+        assert unaffected.status_code == 304 and unaffected.headers["etag"] == etag
+        assert calls == 2
+
+        # a committed ingest bumps the corpus generation and invalidates the entry
+        ingest("2401.50002v1", "cs.DC")
+        fresh = await client.get(
+            "/api/papers", params={"category": "cs.DC", "limit": 5}, headers={"If-None-Match": etag}
+        )
+        assert fresh.status_code == 200 and fresh.headers["etag"] != etag
+        assert len(fresh.json()["items"]) == 2
+        assert calls == 3
+
+        categories = await client.get("/api/categories")
+        assert categories.json() == ["cs.DC", "cs.OS"]
+        index = await client.get("/")
+        assert index.headers["content-type"].startswith("text/html") and "etag" in index.headers
+
+    # the page embeds absolute static URLs, so another origin must not get the cached copy
+    public = httpx.AsyncClient(transport=httpx.ASGITransport(app=app_module.app), base_url="https://public.example.com")
+    async with public:
+        page = await public.get("/")
+    assert 'href="https://public.example.com/static/favicon.ico"' in page.text
+    assert "http://test" not in page.text
+
+
+@pytest.mark.asyncio
+async def test_field_projection_and_detail_endpoint(ingest) -> None:
+    ingest("2401.60001v1", "cs.OS")
+    ingest("cs/0112017v1", "cs.OS")
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        full = await client.get("/api/papers", params={"category": "cs.OS", "limit": 1})
+        slim = await client.get(
+            "/api/papers", params={"category": "cs.OS", "limit": 1, "fields": "arxiv_id,title,categories"}
+        )
+        assert slim.status_code == 200
+        page = slim.json()
+        assert page["items"] == [{"arxiv_id": "cs/0112017v1", "title": "Cached", "categories": ["cs.OS"]}]
+        assert page["total"] == 2 and page["next_cursor"]
+        assert len(slim.content) < len(full.content) / 2
+
+        following = await client.get(
+            "/api/papers", params={"category": "cs.OS", "fields": "arxiv_id", "cursor": page["next_cursor"]}
+        )
+        assert following.json()["items"] == [{"arxiv_id": "2401.60001v1"}]
+
+        bad = await client.get("/api/papers", params={"fields": "arxiv_id,secret"})
+        assert bad.status_code == 400
+
+        detail = await client.get("/api/papers/cs/0112017v1")
+        assert detail.status_code == 200
+        assert detail.json()["abstract"] == "Abstract" and "etag" in detail.headers
+        assert (await client.get("/api/papers/9999.99999v9")).status_code == 404
+
+
+def test_fast_list_document_matches_pydantic_response(ingest) -> None:
+    ingest("2401.70001v1", "cs.AR")
+    ingest("2401.70002v1", "cs.AR")
+    session = database.create_session()
+    try:
+        service = PaperService(session=session)
+        cursor = None
+        for _ in range(2):
+            slow = service.list_papers(category="cs.AR", limit=1, cursor=cursor)
+            fast = service.list_papers_document(category="cs.AR", limit=1, cursor=cursor)
+            assert dumps(fast) == slow.model_dump_json(by_alias=True).encode()
+            cursor = slow.next_cursor
+    finally:
+        session.close()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.config import Settings
+from backend.coordination import DatabaseLease, RefreshCoordinator, SchedulerLeadership
+from backend.service import RefreshStats
+
+pytestmark = pytest.mark.usefixtures("memory_db")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_run() -> None:
+    coordinator = RefreshCoordinator(Settings(scheduler_enabled=False), owner="node-a")
+    calls = 0
+    release = asyncio.Event()
+
+    async def refresh() -> RefreshStats:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return RefreshStats(fetched=3, created=2)
+
+    first = asyncio.create_task(coordinator.run(refresh))
+    second = asyncio.create_task(coordinator.run(refresh))
+    await asyncio.sleep(0)
+    assert coordinator.running
+    release.set()
+
+    results = await asyncio.gather(first, second)
+
+    assert calls == 1
+    assert results[0] is results[1]
+    assert results[0].created == 2
+    assert not coordinator.running
+
+
+@pytest.mark.asyncio
+async def test_refresh_waits_for_other_process_and_reuses_its_result() -> None:
+    configuration = Settings(scheduler_enabled=False, refresh_lock_poll_seconds=0.01)
+    other = DatabaseLease(RefreshCoordinator.LEASE_NAME, owner="node-b", ttl_seconds=60)
+    assert other.try_acquire()
+
+    called = False
+
+    async def refresh() -> RefreshStats:
+        nonlocal called
+        called = True
+        return RefreshStats()
+
+    coordinator = RefreshCoordinator(configuration, owner="node-a")
+    waiting = asyncio.create_task(coordinator.run(refresh))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    other.release('{"fetched": 7, "created": 4, "summarized": 0, "enqueued": 4}')
+    stats = await asyncio.wait_for(waiting, timeout=1)
+
+    assert not called
+    assert stats is not None and stats.fetched == 7 and stats.enqueued == 4
+
+
+def test_scheduler_leadership_is_exclusive_until_resigned() -> None:
+    configuration = Settings(scheduler_enabled=False)
+    node_a = SchedulerLeadership(configuration, owner="node-a")
+    node_b = SchedulerLeadership(configuration, owner="node-b")
+
+    assert node_a.campaign()
+    assert not node_b.campaign()
+    assert node_a.campaign()  # renewal keeps leadership
+
+    node_a.resign()
+    assert node_b.campaign()
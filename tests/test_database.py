@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from backend import database
+from backend.config import settings
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_executor_workers", 2)
+    database.configure_engine(f"sqlite+pysqlite:///{tmp_path / 'papers.sqlite3'}")
+    database.init_db()
+    yield
+    database.shutdown_db_executor()
+
+
+@pytest.mark.asyncio
+async def test_reads_run_on_db_executor_without_blocking_loop(file_db) -> None:
+    ticks = 0
+    stop = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal ticks
+        while not stop.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    def slow_read(session) -> str:
+        time.sleep(0.2)  # stands in for a slow query or a WAL checkpoint
+        session.execute(text("SELECT COUNT(*) FROM papers")).scalar_one()
+        return threading.current_thread().name
+
+    beat = asyncio.create_task(heartbeat())
+    thread_names = await asyncio.gather(database.run_in_session(slow_read), database.run_in_session(slow_read))
+    stop.set()
+    await beat
+
+    assert all(name.startswith("paper-db") for name in thread_names)
+    assert ticks >= 10  # the loop kept running while both reads were in flight
+    pool = database.get_engine().pool
+    assert pool.size() == settings.db_pool_size
+
+
+@pytest.mark.asyncio
+async def test_memory_database_reads_stay_inline() -> None:
+    database.configure_engine("sqlite+pysqlite:///:memory:")
+    database.init_db()
+
+    def current_thread(session) -> str:
+        session.execute(text("SELECT COUNT(*) FROM papers")).scalar_one()
+        return threading.current_thread().name
+
+    assert await database.run_in_session(current_thread) == threading.current_thread().name
+
+
+def test_legacy_version_rows_are_merged_on_startup(tmp_path) -> None:
+    url = f"sqlite+pysqlite:///{tmp_path / 'legacy.sqlite3'}"
+    database.configure_engine(url)
+    with database.get_engine().begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE papers (id INTEGER PRIMARY KEY, arxiv_id VARCHAR(50) NOT NULL UNIQUE, "
+                "title VARCHAR(500) NOT NULL, authors TEXT NOT NULL, abstract TEXT NOT NULL, summary TEXT, "
+                "summary_model VARCHAR(100), summary_language VARCHAR(32), categories VARCHAR(150) NOT NULL, "
+                "link VARCHAR(500) NOT NULL, pdf_url VARCHAR(500), published_at DATETIME NOT NULL, "
+                "updated_at DATETIME NOT NULL, created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "last_summarized_at DATETIME)"
+            )
+        )
+        rows = [
+            (1, "2401.00040v1", "Same abstract.", "Old summary"),
+            (2, "2401.00040v2", "Same  abstract.", None),
+            (3, "2401.00041v1", "Other.", None),
+        ]
+        for paper_id, arxiv_id, abstract, summary in rows:
+            connection.execute(
+                text(
+                    "INSERT INTO papers (id, arxiv_id, title, authors, abstract, summary, categories, link, "
+                    "published_at, updated_at) VALUES (:id, :arxiv_id, 'T', 'A', :abstract, :summary, 'cs.DC', "
+                    "'https://arxiv.org', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+                ),
+                {"id": paper_id, "arxiv_id": arxiv_id, "abstract": abstract, "summary": summary},
+            )
+
+    database.init_db()
+
+    with database.get_engine().connect() as connection:
+        papers = connection.execute(
+            text("SELECT id, arxiv_id, base_id, version, summary FROM papers ORDER BY id")
+        ).all()
+        stats = connection.execute(text("SELECT category, paper_count FROM category_stats")).all()
+    assert [tuple(row) for row in papers] == [
+        (2, "2401.00040v2", "2401.00040", 2, "Old summary"),
+        (3, "2401.00041v1", "2401.00041", 1, None),
+    ]
+    assert [tuple(row) for row in stats] == [("cs.DC", 2)]
+
+
+def test_uncategorized_papers_do_not_rebuild_stats_on_every_boot(tmp_path) -> None:
+    database.configure_engine(f"sqlite+pysqlite:///{tmp_path / 'papers.sqlite3'}")
+    database.init_db()
+    with database.get_engine().begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO papers (arxiv_id, base_id, version, title, authors, abstract, categories, link, "
+                "published_at, updated_at) VALUES ('2401.00042v1', '2401.00042', 1, 'T', 'A', 'Abstract', ' , ', "
+                "'https://arxiv.org', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+            )
+        )
+
+    def generation() -> int:
+        with database.get_engine().connect() as connection:
+            return connection.execute(text("SELECT generation FROM corpus_state WHERE id = 1")).scalar_one()
+
+    before = generation()
+    database.init_db()
+    database.init_db()
+    assert generation() == before
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend import database
+from backend.config import Settings
+from backend.events import HEARTBEAT, PAPER_CREATED, EventBroker
+from backend.service import PaperService
+
+
+async def _collect(subscription, count: int) -> list[bytes]:
+    frames = []
+    async for frame in subscription.frames(heartbeat=0.01):
+        frames.append(frame)
+        if len(frames) == count:
+            break
+    return frames
+
+
+def _event(frame: bytes) -> tuple[int, str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+
+@pytest.mark.asyncio
+async def test_subscribers_resume_from_last_event_id_or_reset() -> None:
+    broker = EventBroker(history=3, client_buffer=8)
+    for index in range(1, 5):
+        broker.publish("paper.created", {"n": index})
+
+    with broker.subscribe(last_event_id=2) as subscription:
+        broker.publish("paper.summarized", {"n": 5})
+        frames = await _collect(subscription, 4)
+    assert [_event(frame)[:2] for frame in frames[:3]] == [
+        (3, "paper.created"),
+        (4, "paper.created"),
+        (5, "paper.summarized"),
+    ]
+    assert frames[3] == HEARTBEAT
+
+    # id 1 has fallen out of the three-event history, and 99 was never issued here
+    for stale in (1, 99):
+        with broker.subscribe(last_event_id=stale) as subscription:
+            (frame,) = await _collect(subscription, 1)
+        assert _event(frame) == (5, "reset", {"last_event_id": 5})
+    assert broker.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_stream_ends_instead_of_buffering() -> None:
+    broker = EventBroker(history=10, client_buffer=2)
+    with broker.subscribe() as subscription:
+        for index in range(4):
+            broker.publish("paper.created", {"n": index})
+        frames = [frame async for frame in subscription.frames(heartbeat=0.01)]
+    assert [_event(frame)[0] for frame in frames] == [1, 2]
+
+    # reconnecting from the last delivered id replays what was dropped
+    with broker.subscribe(last_event_id=2) as subscription:
+        frames = await _collect(subscription, 2)
+    assert [_event(frame)[0] for frame in frames] == [3, 4]
+
+
+def test_ingest_publishes_created_papers(monkeypatch, memory_db, make_scraped_paper) -> None:
+    from backend import service as service_module
+
+    broker = EventBroker()
+    monkeypatch.setattr(service_module, "event_broker", broker)
+    paper = make_scraped_paper("2401.70001v1", title="Streaming")
+    session = database.create_session()
+    try:
+        service = PaperService(session=session, configuration=Settings(llm_api_key=None, scheduler_enabled=False))
+        service._store_metadata([paper])
+        service._store_metadata([paper])
+    finally:
+        session.close()
+
+    assert broker.last_id == 1
+    (event,) = broker._history
+    assert event.type == PAPER_CREATED
+    assert event.data["arxiv_id"] == "2401.70001v1"
+    assert event.data["summary_model"] == "not-run"
+    assert "abstract" not in event.data
+
+
+@pytest.mark.asyncio
+async def test_event_stream_registers_only_while_the_body_is_sent(monkeypatch) -> None:
+    from backend import app as app_module
+
+    broker = EventBroker()
+    monkeypatch.setattr(app_module, "event_broker", broker)
+    response = await app_module.paper_events(last_event_id=None, last_event_header=None)
+    # a client that disconnects before the body starts leaves nothing behind
+    assert broker.subscriber_count() == 0
+
+    body = response.body_iterator
+    assert await body.__anext__() == b"retry: 3000\n\n"
+    assert broker.subscriber_count() == 1
+    await body.aclose()
+    assert broker.subscriber_count() == 0
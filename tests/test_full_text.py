@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+import respx
+from httpx import Response
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from backend import full_text
+
+from backend.config import Settings
+from backend.full_text import (
+    ARXIV_PDF_BASE,
+    DownloadedPdf,
+    download_pdf,
+    extract_pdf_text,
+    shutdown_extraction_pool,
+)
+from backend.pdf_cache import CachedPdf, PdfCache
+
+PDF_HEADERS = {"content-type": "application/pdf", "etag": '"abc"'}
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for text in pages:
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        lines = " ".join(f"({line}) Tj 0 -14 Td" for line in text.splitlines())
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td {lines} ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_download_pdf_reuses_cached_versioned_pdf(tmp_path) -> None:
+    configuration = Settings(pdf_cache_dir=str(tmp_path))
+    route = respx.get(f"{ARXIV_PDF_BASE}/2401.00001v1.pdf").mock(
+        return_value=Response(200, content=b"%PDF-1", headers=PDF_HEADERS)
+    )
+
+    first = await download_pdf("2401.00001v1", None, configuration)
+    second = await download_pdf("2401.00001v1", None, configuration)
+
+    assert first is not None and second is not None
+    assert first.path == second.path
+    assert second.path is not None and second.path.read_bytes() == b"%PDF-1"
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_download_pdf_revalidates_unversioned_pdf(tmp_path) -> None:
+    configuration = Settings(pdf_cache_dir=str(tmp_path))
+    route = respx.get(f"{ARXIV_PDF_BASE}/2401.00002.pdf").mock(
+        side_effect=[Response(200, content=b"%PDF-2", headers=PDF_HEADERS), Response(304)]
+    )
+
+    first = await download_pdf("2401.00002", None, configuration)
+    second = await download_pdf("2401.00002", None, configuration)
+
+    assert first is not None and second is not None
+    assert second.path is not None and second.path.read_bytes() == b"%PDF-2"
+    assert route.calls[1].request.headers["if-none-match"] == '"abc"'
+
+
+def _cache_pdf(cache: PdfCache, arxiv_id: str, payload: bytes) -> CachedPdf | None:
+    # same path as a download: stream into a temp file, then commit it
+    stream, temp_path = cache.open_temp()
+    with stream:
+        stream.write(payload)
+    return cache.commit(arxiv_id, temp_path)
+
+
+def test_pdf_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = PdfCache(tmp_path, max_bytes=10)
+    _cache_pdf(cache, "a", b"12345")
+    _cache_pdf(cache, "b", b"12345")
+    first = cache.lookup("a")
+    assert first is not None
+    cache.touch(first)
+
+    _cache_pdf(cache, "c", b"12345")
+
+    assert cache.lookup("a") is not None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_extract_pdf_text_reuses_process_pool() -> None:
+    configuration = Settings(pdf_extract_workers=1)
+    payload = _make_pdf(["Hello pool", "Second page"])
+    try:
+        first = await extract_pdf_text(DownloadedPdf(buffer=BytesIO(payload)), configuration)
+        pool = full_text._extraction_pool
+        second = await extract_pdf_text(DownloadedPdf(buffer=BytesIO(payload)), configuration)
+
+        assert "Hello pool" in first and "Second page" in first
+        assert second == first
+        assert pool is not None and full_text._extraction_pool is pool
+    finally:
+        shutdown_extraction_pool()
+    assert full_text._extraction_pool is None
+
+
+@pytest.mark.asyncio
+async def test_extract_pdf_text_recycles_pool_on_timeout() -> None:
+    configuration = Settings(pdf_extract_workers=1, pdf_extract_timeout_seconds=0.001)
+    try:
+        text = await extract_pdf_text(DownloadedPdf(buffer=BytesIO(_make_pdf(["Too slow"]))), configuration)
+        assert text == ""
+        assert full_text._extraction_pool is None
+    finally:
+        shutdown_extraction_pool()
+
+
+def test_pdf_text_stops_at_character_budget() -> None:
+    payload = _make_pdf(["A" * 50, "B" * 50, "C" * 50])
+
+    text = full_text._pdf_to_text(payload, max_chars=60)
+
+    assert text.startswith("A" * 50)
+    assert len(text) == 60
+    assert "C" not in text
+
+
+def test_pdf_text_skips_references_and_appendix() -> None:
+    body = "\n".join(["Body text line"] * 200)
+    payload = _make_pdf([body, "Conclusion here\nReferences\n[1] Someone", "Appendix page"])
+
+    text = full_text._pdf_to_text(payload, skip_back_matter=True)
+
+    assert "Conclusion here" in text
+    assert "[1] Someone" not in text
+    assert "Appendix page" not in text
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_download_pdf_streams_into_spooled_buffer_and_enforces_cap() -> None:
+    configuration = Settings(pdf_cache_max_bytes=0, pdf_max_bytes=10)
+    respx.get(f"{ARXIV_PDF_BASE}/2401.00003v1.pdf").mock(
+        return_value=Response(200, content=b"%PDF-3", headers={"content-type": "application/pdf"})
+    )
+    respx.get(f"{ARXIV_PDF_BASE}/2401.00004v1.pdf").mock(
+        return_value=Response(200, content=b"%PDF-" + b"x" * 20, headers={"content-type": "application/pdf"})
+    )
+    respx.get(f"{ARXIV_PDF_BASE}/2401.00004.pdf").mock(return_value=Response(404))
+
+    document = await download_pdf("2401.00003v1", None, configuration)
+    oversized = await download_pdf("2401.00004v1", None, configuration)
+
+    assert document is not None and document.path is None and document.buffer is not None
+    with document:
+        assert document.buffer.read() == b"%PDF-3"
+    assert oversized is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_download_pdf_gives_up_after_an_oversized_body(tmp_path) -> None:
+    configuration = Settings(pdf_cache_dir=str(tmp_path), pdf_max_bytes=10)
+
+    async def chunked_body():
+        yield b"%PDF-"
+        yield b"x" * 20
+
+    pdf_url = "https://export.arxiv.org/pdf/2401.00006v1"
+    first = respx.get(pdf_url).mock(
+        return_value=Response(200, content=chunked_body(), headers={"content-type": "application/pdf"})
+    )
+    others = [
+        respx.get(url).mock(return_value=Response(200, content=b"%PDF-1", headers={"content-type": "application/pdf"}))
+        for url in (f"{pdf_url}.pdf", f"{ARXIV_PDF_BASE}/2401.00006v1.pdf", f"{ARXIV_PDF_BASE}/2401.00006.pdf")
+    ]
+
+    assert await download_pdf("2401.00006v1", pdf_url, configuration) is None
+    assert first.call_count == 1
+    assert [route.call_count for route in others] == [0, 0, 0]
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+@pytest.mark.asyncio
+async def test_extract_pdf_text_reads_cached_file_by_path(tmp_path) -> None:
+    configuration = Settings(pdf_extract_workers=0)
+    cache = PdfCache(tmp_path, max_bytes=1_000_000)
+    entry = _cache_pdf(cache, "2401.00005v1", _make_pdf(["From disk"]))
+    assert entry is not None
+
+    text = await extract_pdf_text(DownloadedPdf(path=entry.path), configuration)
+
+    assert "From disk" in text
+    assert entry.path.exists()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.config import Settings
+from backend.http_client import HttpClientManager
+
+
+@pytest.mark.asyncio
+async def test_http_client_manager_reuses_pooled_client() -> None:
+    manager = HttpClientManager(Settings(http_max_connections=3, http2_enabled=True))
+
+    first = manager.get()
+    second = manager.get()
+
+    assert first is second
+    assert first._transport._pool._max_connections == 3  # type: ignore[attr-defined]
+    await manager.aclose()
+    assert first.is_closed
+    assert manager.get() is not first
+    await manager.aclose()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import cast
+
+import pytest
+
+from backend import database
+from backend.config import Settings
+from backend.jobs import SummaryJobQueue
+from backend.models import Paper, SummaryJob, SummaryJobAttempt
+from backend.scraper import ScrapedPaper
+from backend.service import PaperService
+from backend.summarizer import Summarizer
+from backend.worker import SummaryWorker
+
+
+class FlakySummarizer(Summarizer):
+    def __init__(self, failures: int) -> None:
+        super().__init__(configuration=Settings(llm_api_key="fake", scheduler_enabled=False))
+        self.failures = failures
+        self.calls = 0
+
+    @property
+    def uses_llm(self) -> bool:  # type: ignore[override]
+        return True
+
+    async def summarize(
+        self,
+        title: str,
+        abstract: str,
+        *,
+        full_text: str | None = None,
+    ) -> str:  # type: ignore[override]
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider unavailable")
+        return f"SUMMARY {title}"
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(memory_db, monkeypatch) -> None:
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
+        return None
+
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+
+
+@pytest.fixture
+def scraped(make_scraped_paper):
+    def scraped(index: int) -> ScrapedPaper:
+        return make_scraped_paper(
+            f"2402.0000{index}v1",
+            title=f"Queued {index}",
+            abstract="Abstract content",
+            categories=["cs.OS"],
+            published_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+
+    return scraped
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_drain_leaves_work_for_worker(monkeypatch, scraped) -> None:
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return [scraped(1), scraped(2)]
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    configuration = Settings(llm_api_key="fake", scheduler_enabled=False)
+    summarizer = FlakySummarizer(failures=0)
+    session = database.create_session()
+    try:
+        stats = await PaperService(session, configuration, summarizer).refresh(drain=False)
+        assert (stats.created, stats.enqueued, stats.summarized) == (2, 2, 0)
+        assert summarizer.calls == 0
+
+        await SummaryWorker(session, configuration=configuration, summarizer=summarizer).drain()
+
+        summaries = {cast(str, paper.summary) for paper in session.query(Paper)}
+        assert summaries == {"SUMMARY Queued 1", "SUMMARY Queued 2"}
+        assert {cast(str, job.status) for job in session.query(SummaryJob)} == {SummaryJob.DONE}
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_retry_with_backoff_and_record_attempts(monkeypatch, scraped) -> None:
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return [scraped(3)]
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    configuration = Settings(
+        llm_api_key="fake",
+        scheduler_enabled=False,
+        summary_job_retry_base_seconds=0,
+        summary_job_max_attempts=3,
+    )
+    summarizer = FlakySummarizer(failures=1)
+    session = database.create_session()
+    try:
+        stats = await PaperService(session, configuration, summarizer).refresh()
+
+        assert stats.summarized == 1
+        job = session.query(SummaryJob).one()
+        assert (cast(str, job.status), cast(int, job.attempts)) == (SummaryJob.DONE, 2)
+        attempts = session.query(SummaryJobAttempt).order_by(SummaryJobAttempt.attempt)
+        outcomes = [cast(str, attempt.outcome) for attempt in attempts]
+        assert outcomes == ["failed", "succeeded"]
+    finally:
+        session.close()
+
+
+def test_enqueue_missing_picks_up_failed_papers_and_claims_once() -> None:
+    session = database.create_session()
+    try:
+        paper = Paper(
+            arxiv_id="2402.00009v1",
+            title="Failed earlier",
+            authors="Alice",
+            abstract="Abstract content",
+            categories="cs.OS",
+            link="https://arxiv.org/abs/2402.00009",
+            summary_model="llm-failed",
+            published_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+        session.add(paper)
+        session.commit()
+        queue = SummaryJobQueue(session, Settings())
+
+        assert queue.enqueue_missing() == 1
+        session.commit()
+        assert queue.enqueue_missing() == 0
+
+        claimed = queue.claim("worker-a", limit=5)
+        assert len(claimed) == 1
+        assert queue.claim("worker-b", limit=5) == []
+    finally:
+        session.close()
+
+
+def test_leases_expire_heartbeat_and_release() -> None:
+    session = database.create_session()
+    try:
+        paper = Paper(
+            arxiv_id="2402.00010v1",
+            title="Leased",
+            authors="Alice",
+            abstract="Abstract content",
+            categories="cs.OS",
+            link="https://arxiv.org/abs/2402.00010",
+            published_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+        session.add(paper)
+        session.commit()
+        crashed = SummaryJobQueue(session, Settings(summary_job_lease_seconds=-1))
+        crashed.enqueue([cast(int, paper.id)])
+        session.commit()
+
+        # a node that died mid-job leaves an already expired lease behind
+        job = crashed.claim("node-a", limit=1)[0]
+        queue = SummaryJobQueue(session, Settings())
+        reclaimed = queue.claim("node-b", limit=1)
+        assert [cast(int, item.id) for item in reclaimed] == [cast(int, job.id)]
+        assert queue.heartbeat("node-a", [cast(int, job.id)]) == 0
+        assert queue.heartbeat("node-b", [cast(int, job.id)]) == 1
+
+        assert queue.release("node-b") == 1
+        session.refresh(job)
+        assert (cast(str, job.status), cast(int, job.attempts)) == (SummaryJob.PENDING, 1)
+    finally:
+        session.close()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.config import Settings
+from backend.coordination import RefreshCoordinator
+from backend.refresh_jobs import RefreshJob, RefreshJobRegistry
+from backend.service import RefreshStats
+
+pytestmark = pytest.mark.usefixtures("memory_db")
+
+
+@pytest.mark.asyncio
+async def test_refresh_job_reports_progress_and_result() -> None:
+    step = asyncio.Event()
+    finished: list[RefreshJob] = []
+
+    async def runner(progress) -> RefreshStats:
+        stats = RefreshStats(fetched=2)
+        progress(0, 2, stats, None)
+        stats.created += 1
+        progress(1, 2, stats, None)
+        await step.wait()
+        stats.created += 1
+        stats.timings["ingest"] = 0.5
+        progress(2, 2, stats, None)
+        return stats
+
+    registry = RefreshJobRegistry(
+        RefreshCoordinator(Settings(scheduler_enabled=False), owner="test"),
+        runner,
+        on_finish=finished.append,
+    )
+    job = registry.start()
+    await asyncio.sleep(0.01)
+
+    running = registry.get(job.id).to_response()
+    assert running.status == "running"
+    assert (running.current, running.total, running.stats.created) == (1, 2, 1)
+    assert registry.start() is job  # attaches to the active job
+
+    step.set()
+    await registry.wait(job)
+
+    done = job.to_response()
+    assert done.status == "succeeded"
+    assert done.current == 2 and done.stats.created == 2
+    assert done.stats.timings == {"ingest": 0.5}
+    assert done.finished_at is not None
+    assert finished == [job]
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_refresh_and_releases_lock() -> None:
+    cancelled = asyncio.Event()
+
+    async def runner(progress) -> RefreshStats:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return RefreshStats()
+
+    coordinator = RefreshCoordinator(Settings(scheduler_enabled=False), owner="test")
+    registry = RefreshJobRegistry(coordinator, runner)
+    job = registry.start()
+    await asyncio.sleep(0.01)
+
+    assert registry.cancel(job.id) is job
+    await registry.wait(job)
+
+    assert cancelled.is_set()
+    assert job.status == "cancelled"
+    assert not coordinator.running
+    assert registry.cancel("missing") is None
+    again = registry.start()
+    assert again is not job
+    registry.cancel(again.id)
+    await registry.wait(again)
@@ -5,7 +5,7 @@ import pytest
 import respx
 from httpx import Response
 
-from backend.scraper import ARXIV_RSS_BASE, fetch_category
+from backend.scraper import ARXIV_RSS_BASE, FeedValidators, fetch_category
 
 SAMPLE_FEED = """<?xml version='1.0' encoding='UTF-8'?>
 <rss version="2.0">
@@ -49,4 +49,38 @@ async def test_fetch_category_parses_feed() -> None:
     assert "cs.DC" in first.categories
     assert first.abstract
     assert first.published_at.tzinfo is not None
-    assert first.affiliations == [None]  # no affiliation data in sample feed
\ No newline at end of file
+    assert first.affiliations == [None]  # no affiliation data in sample feed
+
+
+class MemoryFeedState:
+    def __init__(self) -> None:
+        self.validators: dict[str, FeedValidators] = {}
+
+    def lookup(self, url: str) -> FeedValidators | None:
+        return self.validators.get(url)
+
+    def remember(self, url: str, validators: FeedValidators) -> None:
+        self.validators[url] = validators
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_category_skips_unchanged_feeds() -> None:
+    route = respx.get(f"{ARXIV_RSS_BASE}/cs.DC").mock(
+        side_effect=[
+            Response(200, text=SAMPLE_FEED, headers={"etag": '"v1"'}),
+            Response(304),
+            Response(200, text=SAMPLE_FEED),
+        ]
+    )
+    feed_state = MemoryFeedState()
+
+    async with httpx.AsyncClient() as client:
+        first = await fetch_category("cs.DC", max_results=5, client=client, feed_state=feed_state)
+        not_modified = await fetch_category("cs.DC", max_results=5, client=client, feed_state=feed_state)
+        same_body = await fetch_category("cs.DC", max_results=5, client=client, feed_state=feed_state)
+
+    assert len(first) == 2
+    assert not_modified == []
+    assert same_body == []
+    assert route.calls[1].request.headers["if-none-match"] == '"v1"'
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
+from io import BytesIO
 from typing import cast
 
 import pytest
+from sqlalchemy import delete, text
 
 from backend import database
 from backend.config import Settings
-from backend.models import Paper
+from backend.full_text import DownloadedPdf
+from backend.models import Paper, PaperCategory, SummaryJob, SummaryJobAttempt
 from backend.scraper import ScrapedPaper
-from backend.service import PaperService
+from backend.service import InvalidCursor, PaperService
 from backend.summarizer import Summarizer
+from backend.worker import SummaryWorker
 
 
 class DummySummarizer(Summarizer):
@@ -66,7 +71,7 @@ async def test_refresh_persists_new_paper(monkeypatch) -> None:
         updated_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
     )
 
-    async def fake_fetch_all(categories, max_results):
+    async def fake_fetch_all(categories, max_results, **kwargs):
         return [scraped]
 
     monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
@@ -111,15 +116,22 @@ async def test_refresh_fetches_full_text_for_llm(monkeypatch) -> None:
         updated_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
     )
 
-    async def fake_fetch_all(categories, max_results):
+    async def fake_fetch_all(categories, max_results, **kwargs):
         return [scraped]
 
-    async def fake_fetch_full_text(arxiv_id, pdf_url, settings):
+    document = DownloadedPdf(buffer=BytesIO(b"%PDF"))
+
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
         assert arxiv_id == scraped.arxiv_id
+        return document
+
+    async def fake_extract_pdf_text(payload, settings):
+        assert payload is document
         return "完整全文"
 
     monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
-    monkeypatch.setattr("backend.service.fetch_full_text", fake_fetch_full_text)
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+    monkeypatch.setattr("backend.service.extract_pdf_text", fake_extract_pdf_text)
 
     session = database.create_session()
     summarizer = CapturingSummarizer()
@@ -137,5 +149,428 @@ async def test_refresh_fetches_full_text_for_llm(monkeypatch) -> None:
         assert summary_value == "FULL SUMMARY"
         assert stats.summarized == 1
         assert summarizer.calls == ["完整全文"]
+        assert document.buffer is None
+    finally:
+        session.close()
+
+
+class SlowSummarizer(CapturingSummarizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def summarize(
+        self,
+        title: str,
+        abstract: str,
+        *,
+        full_text: str | None = None,
+    ) -> str:  # type: ignore[override]
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return f"SUMMARY {title}"
+
+
+@pytest.mark.asyncio
+async def test_refresh_summarizes_with_bounded_concurrency(monkeypatch) -> None:
+    scraped = [
+        ScrapedPaper(
+            arxiv_id=f"2401.0001{index}v1",
+            title=f"Paper {index}",
+            authors=["Alice"],
+            affiliations=[None],
+            abstract="Abstract content",
+            categories=["cs.DC"],
+            link=f"https://arxiv.org/abs/2401.0001{index}",
+            pdf_url=None,
+            published_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+        )
+        for index in range(6)
+    ]
+
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return scraped
+
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
+        return None
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+
+    session = database.create_session()
+    summarizer = SlowSummarizer()
+    progress: list[tuple[int, int]] = []
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(llm_api_key="dummy", scheduler_enabled=False, summary_concurrency=2),
+            summarizer=summarizer,
+        )
+        stats = await service.refresh(
+            progress=lambda current, total, _stats, _paper: progress.append((current, total)),
+        )
+        assert stats.created == 6
+        assert stats.summarized == 6
+        assert summarizer.peak == 2
+        assert progress[-1] == (6, 6)
+        summaries = {cast(str, paper.summary) for paper in session.query(Paper).all()}
+        assert summaries == {f"SUMMARY Paper {index}" for index in range(6)}
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_batches_upserts_and_keeps_summaries(monkeypatch) -> None:
+    def make(index: int, title: str) -> ScrapedPaper:
+        return ScrapedPaper(
+            arxiv_id=f"2401.0002{index}v1",
+            title=title,
+            authors=["Alice"],
+            affiliations=[None],
+            abstract="Abstract content",
+            categories=["cs.DC"],
+            link=f"https://arxiv.org/abs/2401.0002{index}",
+            pdf_url=None,
+            published_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+        )
+
+    feeds = [
+        [make(index, f"Paper {index}") for index in range(5)],
+        [make(0, "Paper 0 (revised)")] + [make(index, f"Paper {index}") for index in range(1, 6)],
+    ]
+
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return feeds.pop(0)
+
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
+        return None
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+
+    session = database.create_session()
+    summarizer = CapturingSummarizer()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(llm_api_key="dummy", scheduler_enabled=False, refresh_batch_size=2),
+            summarizer=summarizer,
+        )
+        first = await service.refresh()
+        second = await service.refresh()
+
+        assert (first.created, first.summarized) == (5, 5)
+        assert (second.created, second.summarized) == (1, 1)
+        assert len(summarizer.calls) == 6
+        revised = session.query(Paper).filter(Paper.arxiv_id == "2401.00020v1").one()
+        assert cast(str, revised.title) == "Paper 0 (revised)"
+        assert cast(str, revised.summary) == "FULL SUMMARY"
+        assert session.query(Paper).count() == 6
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_new_versions_update_one_row_and_only_real_revisions_requeue(monkeypatch) -> None:
+    def version(number: int, abstract: str) -> ScrapedPaper:
+        return ScrapedPaper(
+            arxiv_id=f"2401.00030v{number}",
+            title=f"Versioned v{number}",
+            authors=["Alice"],
+            affiliations=[None],
+            abstract=abstract,
+            categories=["cs.DC"],
+            link=f"https://arxiv.org/abs/2401.00030v{number}",
+            pdf_url=None,
+            published_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 1, number, tzinfo=timezone.utc),
+        )
+
+    feeds = [
+        [version(1, "Scheduling GPUs.")],
+        [version(2, "  Scheduling\n GPUs. ")],  # re-wrapped only
+        [version(3, "Scheduling GPUs and TPUs.")],
+        [version(1, "Scheduling GPUs.")],  # a lagging feed
+    ]
+
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return feeds.pop(0)
+
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
+        return None
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+
+    class AbstractSummarizer(CapturingSummarizer):
+        async def summarize(self, title: str, abstract: str, *, full_text: str | None = None) -> str:  # type: ignore[override]
+            self.calls.append(full_text)
+            return f"SUMMARY OF {abstract.strip()}"
+
+    session = database.create_session()
+    summarizer = AbstractSummarizer()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(llm_api_key="dummy", scheduler_enabled=False),
+            summarizer=summarizer,
+        )
+        first = await service.refresh()
+        rewrapped = await service.refresh()
+        paper = session.query(Paper).one()
+        assert (first.created, first.summarized, rewrapped.created, rewrapped.revised) == (1, 1, 0, 0)
+        assert (paper.arxiv_id, paper.base_id, paper.version) == ("2401.00030v2", "2401.00030", 2)
+        assert cast(str, paper.summary) == "SUMMARY OF Scheduling GPUs."
+
+        revised = await service.refresh()
+        assert (revised.created, revised.enqueued, revised.revised, revised.summarized) == (0, 0, 1, 0)
+        paper = session.query(Paper).one()
+        assert paper.version == 3
+        assert cast(str, paper.summary) == "SUMMARY OF Scheduling GPUs."  # kept until the re-summary lands
+        job = session.query(SummaryJob).one()
+        assert (job.status, job.priority) == (SummaryJob.PENDING, -10)
+
+        await service.refresh()
+        paper = session.query(Paper).one()
+        assert (paper.arxiv_id, paper.title) == ("2401.00030v3", "Versioned v3")
+        assert len(summarizer.calls) == 1
+        assert service.get_paper("2401.00030v1").arxiv_id == "2401.00030v3"
+
+        await SummaryWorker(session, service=service).drain()
+        paper = session.query(Paper).one()
+        assert cast(str, paper.summary) == "SUMMARY OF Scheduling GPUs and TPUs."
+        assert paper.summary_abstract_hash == paper.abstract_hash
+        assert len(summarizer.calls) == 2
+        job = session.query(SummaryJob).one()
+        assert job.status == SummaryJob.DONE
+        # v1's summary, then the revision's re-summary (previously this one was "skipped")
+        assert [attempt.outcome for attempt in session.query(SummaryJobAttempt).order_by(SummaryJobAttempt.id)] == [
+            "succeeded",
+            "succeeded",
+        ]
+
+        # a failed re-summary must not wipe the summary readers still see
+        assert service._apply_summary(paper, "") is False
+        assert cast(str, paper.summary) == "SUMMARY OF Scheduling GPUs and TPUs."
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_counts_each_paper_once_across_versions(monkeypatch) -> None:
+    def make(arxiv_id: str) -> ScrapedPaper:
+        return ScrapedPaper(
+            arxiv_id=arxiv_id,
+            title=arxiv_id,
+            authors=["Alice"],
+            affiliations=[None],
+            abstract="Abstract",
+            categories=["cs.DC"],
+            link=f"https://arxiv.org/abs/{arxiv_id}",
+            pdf_url=None,
+            published_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 1, 3, tzinfo=timezone.utc),
+        )
+
+    async def fake_fetch_all(categories, max_results, **kwargs):
+        return [make("2401.00050v1"), make("2401.00050v2"), make("2401.00051v1")]
+
+    async def fake_download_pdf(arxiv_id, pdf_url, settings):
+        return None
+
+    monkeypatch.setattr("backend.service.fetch_all_categories", fake_fetch_all)
+    monkeypatch.setattr("backend.service.download_pdf", fake_download_pdf)
+    progress: list[tuple[int, int]] = []
+
+    session = database.create_session()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(llm_api_key="dummy", scheduler_enabled=False),
+            summarizer=CapturingSummarizer(),
+        )
+        stats = await service.refresh(progress=lambda current, total, stats, paper: progress.append((current, total)))
+        assert (stats.fetched, stats.created, stats.summarized) == (2, 2, 2)
+        assert progress[-1] == (2, 2)
+        assert {paper.arxiv_id for paper in session.query(Paper)} == {"2401.00050v2", "2401.00051v1"}
+    finally:
+        session.close()
+
+
+def _listed_paper(arxiv_id: str, title: str, abstract: str, categories: str, day: int = 5) -> ScrapedPaper:
+    timestamp = datetime(2024, 1, day, tzinfo=timezone.utc)
+    return ScrapedPaper(
+        arxiv_id=arxiv_id,
+        title=title,
+        authors=["Alice", "Bob"],
+        affiliations=[None, None],
+        abstract=abstract,
+        categories=categories.split(","),
+        link=f"https://arxiv.org/abs/{arxiv_id}",
+        pdf_url=None,
+        published_at=timestamp,
+        updated_at=timestamp,
+    )
+
+
+def test_search_ranks_matches_and_tracks_updates(monkeypatch) -> None:
+    session = database.create_session()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(scheduler_enabled=False),
+            summarizer=DummySummarizer(),
+        )
+        service._store_metadata(
+            [
+                _listed_paper("2401.10001v1", "Scheduling <GPU> clusters", "We study schedulers.", "cs.DC"),
+                _listed_paper("2401.10002v1", "Kernel tracing", "A note on GPU scheduling overheads.", "cs.OS"),
+                _listed_paper("2401.10003v1", "Unrelated", "Nothing to see here.", "cs.AR"),
+            ]
+        )
+
+        results = service.search("gpu sched")
+        assert [hit.arxiv_id for hit in results.items] == ["2401.10001v1", "2401.10002v1"]
+        assert "<mark>" in (results.items[0].snippet or "")
+        assert "&lt;" in (results.items[0].snippet or "")  # raw HTML from titles is escaped
+
+        assert [hit.arxiv_id for hit in service.search("gpu", category="cs.OS").items] == ["2401.10002v1"]
+        assert service.search('"; DROP').items == []
+
+        unrelated = session.query(Paper).filter(Paper.arxiv_id == "2401.10003v1").one()
+        unrelated.summary = "Covers GPU memory"  # type: ignore[assignment]
+        session.commit()
+        assert "2401.10003v1" in {hit.arxiv_id for hit in service.search("memory").items}
+
+        monkeypatch.setattr("backend.service.search_index_available", lambda: False)
+        fallback = service.search("gpu")
+        assert {hit.arxiv_id for hit in fallback.items} == {"2401.10001v1", "2401.10002v1", "2401.10003v1"}
+        assert all(hit.snippet is None for hit in fallback.items)
+    finally:
+        session.close()
+
+
+def test_list_papers_uses_exact_category_index() -> None:
+    session = database.create_session()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(scheduler_enabled=False),
+            summarizer=DummySummarizer(),
+        )
+        service._store_metadata(
+            [
+                _listed_paper("2401.20001v1", "Accelerators", "Abstract", "cs.AR", day=1),
+                _listed_paper("2401.20002v1", "Clusters", "Abstract", "cs.DC,cs.AR", day=3),
+                _listed_paper("2401.20003v1", "Prefix trap", "Abstract", "cs.A", day=2),
+            ]
+        )
+        page = service.list_papers(category="cs.AR", limit=10)
+        assert page.total == 2
+        assert [item.arxiv_id for item in page.items] == ["2401.20002v1", "2401.20001v1"]
+        assert [item.arxiv_id for item in service.list_papers(category="cs.A", limit=10).items] == ["2401.20003v1"]
+
+        # re-ingest with a changed category list rewrites the index rows
+        service._store_metadata([_listed_paper("2401.20002v1", "Clusters", "Abstract", "cs.DC", day=3)])
+        assert service.list_papers(category="cs.AR", limit=10).total == 1
+
+        # rows written before the table existed are backfilled on startup
+        session.execute(delete(PaperCategory))
+        session.commit()
+        database.init_db()
+        assert service.list_papers(category="cs.DC", limit=10).total == 1
+
+        plan = " ".join(
+            str(row[-1])
+            for row in session.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT count(*) FROM paper_categories WHERE category = 'cs.AR'"
+                )
+            )
+        )
+        assert "COVERING INDEX ix_paper_categories_category_published" in plan
+    finally:
+        session.close()
+
+
+def test_list_papers_keyset_pages_are_stable_under_inserts() -> None:
+    session = database.create_session()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(scheduler_enabled=False),
+            summarizer=DummySummarizer(),
+        )
+        # two papers share a timestamp so the id tie-breaker matters
+        service._store_metadata(
+            [_listed_paper(f"2401.3000{day}v1", f"Paper {day}", "Abstract", "cs.OS", day=day) for day in (1, 2, 3, 4, 5)]
+            + [_listed_paper("2401.30009v1", "Same day", "Abstract", "cs.OS", day=3)]
+        )
+
+        for category, expected_total in (("cs.OS", 6), (None, 7)):
+            first = service.list_papers(category=category, limit=2)
+            assert first.total == expected_total and first.next_cursor
+
+            # a refresh lands between page loads; the cursor neither repeats nor skips items
+            service._store_metadata([_listed_paper(f"2401.3100{len(category or '')}v1", "Newest", "Abstract", "cs.OS", day=9)])
+
+            seen = [item.arxiv_id for item in first.items]
+            cursor = first.next_cursor
+            while cursor:
+                page = service.list_papers(category=category, limit=2, cursor=cursor)
+                assert page.total is None
+                seen.extend(item.arxiv_id for item in page.items)
+                cursor = page.next_cursor
+            assert len(seen) == len(set(seen)) == expected_total
+            assert seen[:2] == [first.items[0].arxiv_id, first.items[1].arxiv_id]
+            assert seen[seen.index("2401.30009v1") + 1] == "2401.30003v1"  # same timestamp: higher id first
+            assert seen[-1] == "2401.30001v1"
+
+        assert service.list_papers(category="cs.OS", limit=2, cursor=cursor or "", include_total=True).total == 8
+        with pytest.raises(InvalidCursor):
+            service.list_papers(category=None, limit=2, cursor="not-a-cursor")
+    finally:
+        session.close()
+
+
+def test_category_catalog_is_incremental_and_generation_cached() -> None:
+    session = database.create_session()
+    try:
+        service = PaperService(
+            session=session,
+            configuration=Settings(scheduler_enabled=False),
+            summarizer=DummySummarizer(),
+        )
+        assert service.category_stats() == []
+        service._store_metadata(
+            [
+                _listed_paper("2401.40001v1", "One", "Abstract", "cs.DC,cs.OS", day=1),
+                _listed_paper("2401.40002v1", "Two", "Abstract", "cs.DC", day=4),
+            ]
+        )
+        stats = {entry.category: entry for entry in service.category_stats()}
+        assert {name: entry.paper_count for name, entry in stats.items()} == {"cs.DC": 2, "cs.OS": 1}
+        assert stats["cs.DC"].latest_published_at == datetime(2024, 1, 4)
+
+        # without a generation bump the cached catalog is served as-is
+        session.execute(text("UPDATE category_stats SET latest_published_at = NULL"))
+        session.commit()
+        assert service.category_stats()[0].latest_published_at == datetime(2024, 1, 4)
+
+        # re-ingest moves paper one out of cs.OS: counts adjust and the cache is invalidated
+        service._store_metadata([_listed_paper("2401.40001v1", "One", "Abstract", "cs.DC,cs.AR", day=1)])
+        assert service.distinct_categories() == ["cs.AR", "cs.DC"]
+        assert {entry.category: entry.paper_count for entry in service.category_stats()}["cs.AR"] == 1
+
+        # a lost catalog is rebuilt from paper_categories on startup
+        session.execute(text("DELETE FROM category_stats"))
+        session.commit()
+        database.init_db()
+        assert {entry.category: entry.paper_count for entry in service.category_stats()} == {"cs.AR": 1, "cs.DC": 2}
     finally:
         session.close()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from backend import database
+from backend.config import Settings
+from backend.scraper import ScrapedPaper
+from backend.serialization import dumps
+from backend.service import PaperService
+from backend.snapshots import SnapshotWriter
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+@pytest.fixture
+def paper(make_scraped_paper):
+    def paper(arxiv_id: str, categories: list[str], day: int) -> ScrapedPaper:
+        return make_scraped_paper(
+            arxiv_id,
+            day=day,
+            title=f"Paper <{arxiv_id}> & co",
+            authors=["Alice", "Bob"],
+            categories=categories,
+            pdf_url=f"https://arxiv.org/pdf/{arxiv_id}",
+        )
+
+    return paper
+
+
+def test_snapshot_matches_api_and_skips_unchanged_generation(tmp_path, memory_db, paper) -> None:
+    configuration = Settings(
+        llm_api_key=None,
+        scheduler_enabled=False,
+        snapshot_dir=str(tmp_path),
+        snapshot_base_url="https://digest.example.org/",
+    )
+    session = database.create_session()
+    try:
+        service = PaperService(session=session, configuration=configuration)
+        service._store_metadata(
+            [paper("2401.60001v1", ["cs.DC"], 3), paper("2401.60002v1", ["cs.DC", "cs.OS"], 4)]
+        )
+
+        assert SnapshotWriter(session, configuration).write() is True
+        expected = service.list_papers_document(
+            category="cs.DC", limit=configuration.snapshot_papers_per_category, include_total=True
+        )
+        assert (tmp_path / "papers" / "cs.DC.json").read_bytes() == dumps(expected)
+        categories = json.loads((tmp_path / "categories.json").read_text())
+        assert {entry["category"]: entry["paper_count"] for entry in categories} == {"cs.DC": 2, "cs.OS": 1}
+
+        feed = ET.parse(tmp_path / "feeds" / "cs.OS.xml").getroot()
+        assert [entry.findtext(f"{ATOM}title") for entry in feed.iter(f"{ATOM}entry")] == [
+            "Paper <2401.60002v1> & co"
+        ]
+        assert feed.find(f"{ATOM}link[@rel='self']").get("href") == "https://digest.example.org/feeds/cs.OS.xml"
+        assert len(ET.parse(tmp_path / "atom.xml").getroot().findall(f"{ATOM}entry")) == 2
+        assert "Paper &lt;2401.60001v1&gt; &amp; co" in (tmp_path / "index.html").read_text()
+        assert not list(tmp_path.rglob(".tmp-*"))
+
+        # Nothing changed: the manifest generation matches and nothing is rewritten
+        assert SnapshotWriter(session, configuration).write() is False
+
+        # A category that disappears from the corpus loses its files
+        service._store_metadata([paper("2401.60002v1", ["cs.DC"], 4)])
+        assert SnapshotWriter(session, configuration).write() is True
+        assert not (tmp_path / "papers" / "cs.OS.json").exists()
+        assert not (tmp_path / "feeds" / "cs.OS.xml").exists()
+    finally:
+        session.close()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
+from backend import database
 from backend.config import Settings
+from backend.llm_cache import LLMResponseCache
+from backend.models import LLMCacheEntry
 from backend.summarizer import Summarizer
 
 
@@ -19,3 +24,85 @@ async def test_fallback_summary_contains_title_and_sentences() -> None:
     summary = await summarizer.summarize("示例论文", abstract)
 
     assert summary == ""
+
+
+class ScriptedSummarizer(Summarizer):
+    def __init__(self, configuration: Settings) -> None:
+        super().__init__(configuration=configuration)
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _call_llm(self, prompt: str) -> str:  # type: ignore[override]
+        self.prompts.append(prompt)
+        if "局部总结" in prompt:
+            return prompt
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        # later segments finish first to prove the reduce step keeps segment order
+        await asyncio.sleep(0.01 * (10 - len(self.prompts)))
+        self.in_flight -= 1
+        if "第2段" in prompt:
+            raise RuntimeError("segment failed")
+        marker = prompt.split("篇章进度: ", 1)[1].split("，", 1)[0]
+        return f"NOTE {marker}"
+
+
+@pytest.mark.asyncio
+async def test_segment_summaries_run_concurrently_and_keep_order() -> None:
+    configuration = Settings(
+        llm_api_key="fake",
+        full_text_chunk_chars=1000,
+        full_text_chunk_overlap=0,
+        full_text_max_chunks=4,
+        summary_chunk_concurrency=2,
+    )
+    summarizer = ScriptedSummarizer(configuration)
+
+    reduce_prompt = await summarizer.summarize("示例论文", "摘要", full_text="x" * 4000)
+
+    assert summarizer.peak == 2
+    notes = reduce_prompt.split("局部总结: ", 1)[1]
+    assert notes.index("NOTE 第1段") < notes.index("NOTE 第3段") < notes.index("NOTE 第4段")
+    assert "NOTE 第2段" not in notes
+
+
+class CountingSummarizer(Summarizer):
+    def __init__(self, configuration: Settings, cache: LLMResponseCache) -> None:
+        super().__init__(configuration=configuration, cache=cache)
+        self.requests = 0
+
+    async def _request_completion(self, prompt: str) -> str:  # type: ignore[override]
+        self.requests += 1
+        return f"RESPONSE {len(prompt)}"
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_reuses_responses_and_evicts() -> None:
+    database.configure_engine("sqlite+pysqlite:///:memory:")
+    database.init_db()
+    configuration = Settings(llm_api_key="fake", llm_cache_max_entries=1)
+    cache = LLMResponseCache(configuration=configuration)
+    summarizer = CountingSummarizer(configuration, cache)
+
+    first = await summarizer.summarize("示例论文", "摘要一")
+    again = await summarizer.summarize("示例论文", "摘要一")
+    assert first == again
+    assert summarizer.requests == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    session = database.create_session()
+    try:
+        # a hit is only recorded in memory; the lookup itself never writes
+        assert session.query(LLMCacheEntry).one().hit_count == 0
+        cache.flush()
+        session.expire_all()
+        assert session.query(LLMCacheEntry).one().hit_count == 1
+    finally:
+        session.close()
+
+    await summarizer.summarize("另一篇论文", "摘要二")
+    session = database.create_session()
+    try:
+        assert session.query(LLMCacheEntry).count() == 1
+    finally:
+        session.close()